@@ -3,12 +3,14 @@ Customer Service - 비즈니스 로직
 B2B ERP 고객 데이터 분석 및 ML 서비스
 """
 import csv
+import os
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
 # 데이터 분석 및 머신러닝 라이브러리
 import pandas as pd
 import numpy as np
+import joblib
 
 # Scikit-learn 모듈들
 from sklearn.model_selection import train_test_split
@@ -22,6 +24,10 @@ from datasets import Dataset, DatasetDict
 # 디버깅 도구
 from icecream import ic
 
+# ic는 호출마다 프레임 검사를 수행하므로 ML_DEBUG=1일 때만 출력 활성화
+if os.getenv("ML_DEBUG") != "1":
+    ic.disable()
+
 # 내부 모듈
 from app.customer.customer_model import (
     CustomerDetail, CustomerSimple, CustomerStatistics,
@@ -35,7 +41,23 @@ class CustomerService:
     def __init__(self):
         """초기화"""
         self.csv_path = Path(__file__).parent / "customer_data.csv"
+        self.model_path = Path(__file__).parent / "rf_model.joblib"
         self.df: Optional[pd.DataFrame] = None
+        self._train_result: Optional[Dict[str, Any]] = None
+        self._train_mtime: Optional[float] = None
+        self._stats_cache: Dict[str, tuple] = {}
+        self._feature_cols = [
+            'total_orders', 'total_revenue', 'avg_order_value',
+            'last_order_days', 'contract_months', 'employee_count',
+            'overdue_count', 'response_time_hours', 'meeting_count',
+            'support_tickets', 'annual_growth_rate'
+        ]
+        self._X: Optional[np.ndarray] = None
+        self._y: Optional[np.ndarray] = None
+        self._id_index: Dict[str, int] = {}
+        self._by_status: Dict[Any, np.ndarray] = {}
+        self._by_industry: Dict[Any, np.ndarray] = {}
+        self._by_churn: Dict[Any, np.ndarray] = {}
         self.model = CustomerModel()
         ic(f"📁 CSV 경로: {self.csv_path}")
     
@@ -43,96 +65,162 @@ class CustomerService:
         """CSV 데이터 로드"""
         if self.df is None:
             ic("📂 고객 데이터 로딩 중...")
-            self.df = pd.read_csv(self.csv_path)
+            try:
+                # pyarrow 엔진은 멀티스레드 파싱이라 콜드 스타트가 빠름
+                self.df = pd.read_csv(self.csv_path, engine='pyarrow')
+            except (ImportError, ValueError):
+                self.df = pd.read_csv(self.csv_path)
+            # 수치 컬럼 다운캐스트: 집계 패스의 메모리 대역폭 절감
+            self.df = self.df.astype({
+                'churn_risk': 'int8',
+                'overdue_count': 'int8',
+                'support_tickets': 'int16',
+                'meeting_count': 'int16',
+                'contract_months': 'int16',
+                'last_order_days': 'int16',
+                'employee_count': 'int32',
+                'total_orders': 'int32',
+                'avg_order_value': 'int32',
+                'response_time_hours': 'float32',
+                'annual_growth_rate': 'float32',
+            })
+            # 저카디널리티 문자열 컬럼은 category로: 비교/그룹핑이 코드(int8) 연산이 됨
+            for col in ['status', 'industry', 'region', 'payment_terms', 'company_type']:
+                self.df[col] = self.df[col].astype('category')
+            # 특성 행렬/타겟을 연속 메모리 배열로 한 번만 구성 (학습/예측 공용)
+            self._X = np.ascontiguousarray(
+                self.df[self._feature_cols].to_numpy(dtype=np.float32)
+            )
+            self._y = self.df['churn_risk'].to_numpy(dtype=np.int8)
+            # customer_id → 행 번호 인덱스 (ID 조회를 O(1)로)
+            self._id_index = {
+                cid: i for i, cid in enumerate(self.df['customer_id'].to_numpy())
+            }
+            # 필터 키 → 행 번호 배열 (필터링 시 전체 컬럼 스캔 생략)
+            self._by_status = dict(self.df.groupby('status').indices)
+            self._by_industry = dict(self.df.groupby('industry').indices)
+            self._by_churn = dict(self.df.groupby('churn_risk').indices)
             ic(f"✅ {len(self.df)}개 고객 데이터 로드 완료")
         return self.df
     
+    def warmup(self) -> None:
+        """서비스 시작 시 데이터/인덱스 프리로드 및 스코어링 커널 워밍업"""
+        df = self.load_data()
+        # JIT 커널을 첫 요청 전에 컴파일해 두기 위한 1행 더미 호출
+        self.model.predict_churn_batch(df.head(1))
+        # 모델 준비: 저장된 아티팩트가 있으면 로드, 없으면 1회 학습
+        self.train_model()
+        ic("🔥 고객 서비스 워밍업 완료")
+
     # ========================================================================
     # 1. 고객 데이터 조회 (CRUD)
     # ========================================================================
-    
+
+    @staticmethod
+    def _rows_to_details(df: pd.DataFrame) -> List[CustomerDetail]:
+        """DataFrame → CustomerDetail 리스트 변환 (신뢰된 내부 데이터라 검증 생략)"""
+        records = df.to_dict(orient="records")
+        return [CustomerDetail.model_construct(**r) for r in records]
+
     def get_all_customers(self, limit: Optional[int] = None) -> List[CustomerDetail]:
         """전체 고객 조회"""
         df = self.load_data()
-        
+
         if limit:
             df = df.head(limit)
-        
-        customers = []
-        for _, row in df.iterrows():
-            customer = CustomerDetail(**row.to_dict())
-            customers.append(customer)
-        
+
+        customers = self._rows_to_details(df)
+
         ic(f"📋 {len(customers)}개 고객 조회")
         return customers
+
+    def get_customer_records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """전체 고객을 직렬화용 dict 레코드로 반환 (HTTP 경계에서 바로 인코딩)"""
+        df = self.load_data()
+
+        if limit:
+            df = df.head(limit)
+
+        return df.to_dict(orient="records")
     
     def get_customers_simple(self, limit: Optional[int] = None) -> List[CustomerSimple]:
         """고객 간단 정보 조회 (화면 표시용)"""
+        return [
+            CustomerSimple.model_construct(**r)
+            for r in self.get_customer_simple_records(limit=limit)
+        ]
+
+    def get_customer_simple_records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """고객 간단 정보를 직렬화용 dict 레코드로 반환"""
         df = self.load_data()
-        
+
         if limit:
             df = df.head(limit)
-        
-        customers = []
-        for _, row in df.iterrows():
-            customer = CustomerSimple(
-                customer_id=row['customer_id'],
-                company_name=row['company_name'],
-                status=row['status'],
-                total_orders=row['total_orders'],
-                total_revenue=row['total_revenue'],
-                churn_risk="위험" if row['churn_risk'] == 1 else "안전"
+
+        # 필요한 컬럼만 NumPy 배열로 추출해 행 단위 Series 생성 비용 제거
+        cols = df[['customer_id', 'company_name', 'status',
+                   'total_orders', 'total_revenue', 'churn_risk']]
+        arrs = {c: cols[c].to_numpy() for c in cols.columns}
+        risk_labels = np.where(arrs['churn_risk'] == 1, "위험", "안전")
+
+        return [
+            {
+                'customer_id': cid,
+                'company_name': name,
+                'status': status,
+                'total_orders': int(orders),
+                'total_revenue': int(revenue),
+                'churn_risk': str(risk)  # np.str_ → str (orjson 직렬화 호환)
+            }
+            for cid, name, status, orders, revenue, risk in zip(
+                arrs['customer_id'], arrs['company_name'], arrs['status'],
+                arrs['total_orders'], arrs['total_revenue'], risk_labels
             )
-            customers.append(customer)
-        
-        return customers
+        ]
     
     def get_customer_by_id(self, customer_id: str) -> Optional[CustomerDetail]:
         """고객 ID로 조회"""
         df = self.load_data()
-        customer_df = df[df['customer_id'] == customer_id]
-        
-        if customer_df.empty:
+        idx = self._id_index.get(customer_id)
+
+        if idx is None:
             ic(f"❌ 고객 {customer_id} 없음")
             return None
-        
-        customer = CustomerDetail(**customer_df.iloc[0].to_dict())
+
+        customer = CustomerDetail.model_construct(**df.iloc[idx].to_dict())
         ic(f"✅ 고객 {customer_id} 조회 완료")
         return customer
     
     def filter_by_status(self, status: str) -> List[CustomerDetail]:
         """상태별 필터링 (활성/비활성)"""
         df = self.load_data()
-        filtered_df = df[df['status'] == status]
-        
-        customers = []
-        for _, row in filtered_df.iterrows():
-            customers.append(CustomerDetail(**row.to_dict()))
-        
+        indices = self._by_status.get(status)
+        filtered_df = df.take(indices) if indices is not None else df.iloc[0:0]
+
+        customers = self._rows_to_details(filtered_df)
+
         ic(f"📊 상태={status}: {len(customers)}개")
         return customers
     
     def filter_by_industry(self, industry: str) -> List[CustomerDetail]:
         """업종별 필터링"""
         df = self.load_data()
-        filtered_df = df[df['industry'] == industry]
-        
-        customers = []
-        for _, row in filtered_df.iterrows():
-            customers.append(CustomerDetail(**row.to_dict()))
-        
+        indices = self._by_industry.get(industry)
+        filtered_df = df.take(indices) if indices is not None else df.iloc[0:0]
+
+        customers = self._rows_to_details(filtered_df)
+
         ic(f"📊 업종={industry}: {len(customers)}개")
         return customers
     
     def filter_by_churn_risk(self, risk: int) -> List[CustomerDetail]:
         """이탈 위험도별 필터링 (0=안전, 1=위험)"""
         df = self.load_data()
-        filtered_df = df[df['churn_risk'] == risk]
-        
-        customers = []
-        for _, row in filtered_df.iterrows():
-            customers.append(CustomerDetail(**row.to_dict()))
-        
+        indices = self._by_churn.get(risk)
+        filtered_df = df.take(indices) if indices is not None else df.iloc[0:0]
+
+        customers = self._rows_to_details(filtered_df)
+
         risk_label = "위험" if risk == 1 else "안전"
         ic(f"📊 이탈 위험={risk_label}: {len(customers)}개")
         return customers
@@ -142,62 +230,95 @@ class CustomerService:
     # ========================================================================
     
     def get_statistics(self) -> CustomerStatistics:
-        """전체 고객 통계"""
+        """전체 고객 통계 (CSV 변경 전까지 캐시)"""
+        mtime = self.csv_path.stat().st_mtime_ns
+        cached = self._stats_cache.get('overview')
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
         df = self.load_data()
-        
+
+        # 상태 카운트는 value_counts 한 번으로, 매출은 sum/mean 동시 집계
+        status_counts = df['status'].value_counts()
+        revenue_agg = df['total_revenue'].agg(['sum', 'mean'])
+
         stats = CustomerStatistics(
             total_customers=len(df),
-            active_customers=len(df[df['status'] == '활성']),
-            inactive_customers=len(df[df['status'] == '비활성']),
-            high_risk_customers=len(df[df['churn_risk'] == 1]),
-            total_revenue=int(df['total_revenue'].sum()),
-            avg_revenue_per_customer=float(df['total_revenue'].mean()),
+            active_customers=int(status_counts.get('활성', 0)),
+            inactive_customers=int(status_counts.get('비활성', 0)),
+            high_risk_customers=int((df['churn_risk'] == 1).sum()),
+            total_revenue=int(revenue_agg['sum']),
+            avg_revenue_per_customer=float(revenue_agg['mean']),
             avg_orders_per_customer=float(df['total_orders'].mean())
         )
         
+        self._stats_cache['overview'] = (mtime, stats)
+
         ic("📊 통계 계산 완료")
         return stats
     
     def get_industry_statistics(self) -> List[IndustryStatistics]:
-        """업종별 통계"""
+        """업종별 통계 (CSV 변경 전까지 캐시)"""
+        mtime = self.csv_path.stat().st_mtime_ns
+        cached = self._stats_cache.get('industry')
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
         df = self.load_data()
-        
-        industry_stats = []
-        for industry in df['industry'].unique():
-            industry_df = df[df['industry'] == industry]
-            
-            stat = IndustryStatistics(
-                industry=industry,
-                customer_count=len(industry_df),
-                total_revenue=int(industry_df['total_revenue'].sum()),
-                avg_revenue=float(industry_df['total_revenue'].mean()),
-                churn_rate=float(industry_df['churn_risk'].mean() * 100)
-            )
-            industry_stats.append(stat)
-        
+
+        # 업종별 집계를 한 번의 groupby 패스로 계산
+        agg = df.groupby('industry', sort=False, observed=True).agg(
+            customer_count=('customer_id', 'size'),
+            total_revenue=('total_revenue', 'sum'),
+            avg_revenue=('total_revenue', 'mean'),
+            churn_rate=('churn_risk', 'mean')
+        ).reset_index()
+        agg['churn_rate'] *= 100
+
         # 매출 순으로 정렬
-        industry_stats.sort(key=lambda x: x.total_revenue, reverse=True)
-        
+        agg = agg.sort_values('total_revenue', ascending=False)
+
+        industry_stats = [
+            IndustryStatistics(
+                industry=r['industry'],
+                customer_count=int(r['customer_count']),
+                total_revenue=int(r['total_revenue']),
+                avg_revenue=float(r['avg_revenue']),
+                churn_rate=float(r['churn_rate'])
+            )
+            for r in agg.to_dict(orient='records')
+        ]
+
+        self._stats_cache['industry'] = (mtime, industry_stats)
+
         ic(f"📊 {len(industry_stats)}개 업종 통계 완료")
         return industry_stats
     
     def get_top_customers(self, limit: int = 10, by: str = "revenue") -> List[CustomerDetail]:
         """상위 고객 조회"""
         df = self.load_data()
-        
+
         if by == "revenue":
-            sorted_df = df.sort_values('total_revenue', ascending=False)
+            by_col = 'total_revenue'
         elif by == "orders":
-            sorted_df = df.sort_values('total_orders', ascending=False)
+            by_col = 'total_orders'
         else:
-            sorted_df = df
-        
-        top_df = sorted_df.head(limit)
-        
-        customers = []
-        for _, row in top_df.iterrows():
-            customers.append(CustomerDetail(**row.to_dict()))
-        
+            by_col = None
+
+        if by_col is None:
+            top_df = df.head(limit)
+        else:
+            col = df[by_col].to_numpy()
+            if limit < len(col) // 4:
+                # limit ≪ N이면 전체 정렬 대신 O(N) 부분 선택
+                idx = np.argpartition(-col, limit)[:limit]
+                idx = idx[np.argsort(-col[idx])]
+                top_df = df.iloc[idx]
+            else:
+                top_df = df.sort_values(by_col, ascending=False).head(limit)
+
+        customers = self._rows_to_details(top_df)
+
         ic(f"🏆 상위 {limit}개 고객 조회 (기준: {by})")
         return customers
     
@@ -237,19 +358,13 @@ class CustomerService:
     def split_data(self, test_size: float = 0.2) -> Dict[str, Any]:
         """학습/테스트 데이터 분할"""
         ic("✂️ 데이터 분할 시작")
-        df = self.load_data()
-        
-        # 특성과 타겟 분리
-        feature_columns = [
-            'total_orders', 'total_revenue', 'avg_order_value',
-            'last_order_days', 'contract_months', 'employee_count',
-            'overdue_count', 'response_time_hours', 'meeting_count',
-            'support_tickets', 'annual_growth_rate'
-        ]
-        
-        X = df[feature_columns]
-        y = df['churn_risk']
-        
+        self.load_data()
+
+        # 로드 시 구성해 둔 특성 행렬/타겟 재사용
+        feature_columns = self._feature_cols
+        X = self._X
+        y = self._y
+
         # 분할
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=test_size, random_state=42, stratify=y
@@ -270,21 +385,36 @@ class CustomerService:
     # ========================================================================
     
     def train_model(self) -> Dict[str, Any]:
-        """이탈 예측 모델 학습"""
+        """이탈 예측 모델 학습 (CSV가 바뀌지 않으면 저장된 모델 재사용)"""
+        csv_mtime = self.csv_path.stat().st_mtime
+
+        # 메모리 캐시 히트: 같은 데이터로 이미 학습한 경우
+        if self._train_result is not None and self._train_mtime == csv_mtime:
+            ic("♻️ 캐시된 학습 결과 반환")
+            return self._train_result
+
+        # 디스크 캐시 히트: 프로세스 재시작 후에도 재학습 생략
+        if self.model_path.exists() and self.model_path.stat().st_mtime >= csv_mtime:
+            try:
+                model, result = joblib.load(self.model_path)
+            except Exception as e:
+                # 손상되었거나 sklearn 버전이 다른 아티팩트 — 버리고 재학습
+                ic(f"⚠️ 저장된 모델 로드 실패 (재학습으로 폴백): {e}")
+            else:
+                self.model.model = model
+                self._train_result = result
+                self._train_mtime = csv_mtime
+                ic("♻️ 저장된 모델 로드 완료")
+                return result
+
         ic("🤖 모델 학습 시작")
-        df = self.load_data()
-        
-        # 특성과 타겟 분리
-        feature_columns = [
-            'total_orders', 'total_revenue', 'avg_order_value',
-            'last_order_days', 'contract_months', 'employee_count',
-            'overdue_count', 'response_time_hours', 'meeting_count',
-            'support_tickets', 'annual_growth_rate'
-        ]
-        
-        X = df[feature_columns]
-        y = df['churn_risk']
-        
+        self.load_data()
+
+        # 로드 시 구성해 둔 특성 행렬/타겟 재사용
+        feature_columns = self._feature_cols
+        X = self._X
+        y = self._y
+
         # 학습/테스트 분할
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42, stratify=y
@@ -303,14 +433,29 @@ class CustomerService:
         sorted_importance = dict(sorted(feature_importance.items(), key=lambda x: x[1], reverse=True))
         
         ic(f"✅ 모델 학습 완료 (정확도: {accuracy:.2%})")
-        
-        return {
+
+        result = {
             "model_type": "RandomForestClassifier",
             "accuracy": float(accuracy),
             "train_size": len(X_train),
             "test_size": len(X_test),
             "feature_importance": sorted_importance
         }
+
+        # 학습된 모델/결과를 저장해 다음 호출부터 재학습 생략
+        # 임시 파일에 쓴 뒤 원자적으로 교체 — 동시 워커나 중단된 쓰기가
+        # 반쪽짜리 아티팩트를 남기지 않음. 저장 실패는 학습 결과에 영향 없음.
+        try:
+            tmp_path = self.model_path.with_suffix('.joblib.tmp')
+            joblib.dump((model, result), tmp_path)
+            os.replace(tmp_path, self.model_path)
+        except Exception as e:
+            ic(f"⚠️ 모델 저장 실패 (메모리 캐시로 계속): {e}")
+        self.model.model = model
+        self._train_result = result
+        self._train_mtime = csv_mtime
+
+        return result
     
     def predict_churn(self, customer_id: str) -> ChurnPrediction:
         """고객 이탈 확률 예측"""
@@ -321,9 +466,16 @@ class CustomerService:
         
         # 고객 데이터를 딕셔너리로 변환
         customer_data = customer.model_dump()
-        
-        # 이탈 확률 예측
-        churn_prob = self.model.predict_churn(customer_data)
+
+        # 이탈 확률 예측: 학습된 모델이 있으면 실제 예측, 없으면 규칙 기반
+        if self.model.model is not None:
+            features = np.array(
+                [[customer_data[f] for f in self.model.feature_names]],
+                dtype=np.float32
+            )
+            churn_prob = float(self.model.model.predict_proba(features)[0, 1])
+        else:
+            churn_prob = self.model.predict_churn(customer_data)
         risk_level = self.model.get_risk_level(churn_prob)
         key_factors = self.model.get_key_factors(customer_data)
         recommendations = self.model.get_recommendations(risk_level, key_factors)
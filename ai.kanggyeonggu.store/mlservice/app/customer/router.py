@@ -2,8 +2,14 @@
 Customer Router - FastAPI 라우터
 B2B ERP 고객 관리 API
 """
-from typing import Optional, List, Dict, Any
-from fastapi import APIRouter, HTTPException, Query
+from collections import OrderedDict
+from typing import Callable, Optional, List, Dict, Any
+
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+
 from app.customer.customer_service import CustomerService
 from app.customer.customer_model import (
     CustomerDetail, CustomerSimple, CustomerStatistics,
@@ -13,6 +19,7 @@ from app.customer.customer_model import (
 # 라우터 생성
 router = APIRouter(
     tags=["Customer"],
+    default_response_class=ORJSONResponse,
     responses={
         404: {"description": "데이터를 찾을 수 없습니다"},
         500: {"description": "서버 내부 오류"},
@@ -22,6 +29,24 @@ router = APIRouter(
 # 서비스 인스턴스 생성
 customer_service = CustomerService()
 
+# (엔드포인트, 쿼리) → (CSV mtime, 직렬화된 JSON 바이트) 응답 캐시
+# limit는 사용자 입력이라 키가 무한정 늘 수 있으므로 LRU로 크기를 제한
+_RESPONSE_CACHE_MAX = 64
+_response_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def _cached_json(key: tuple, build_payload: Callable[[], Any]) -> Response:
+    """CSV가 바뀌기 전까지 직렬화된 응답 바이트를 그대로 재사용"""
+    mtime = customer_service.csv_path.stat().st_mtime_ns
+    cached = _response_cache.get(key)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, orjson.dumps(build_payload()))
+        _response_cache[key] = cached
+        while len(_response_cache) > _RESPONSE_CACHE_MAX:
+            _response_cache.popitem(last=False)
+    _response_cache.move_to_end(key)
+    return Response(content=cached[1], media_type="application/json")
+
 
 # ============================================================================
 # 1. 고객 데이터 조회 (CRUD)
@@ -61,8 +86,11 @@ async def get_customers_simple(
 ):
     """고객 목록 조회 (간단 버전)"""
     try:
-        customers = customer_service.get_customers_simple(limit=limit)
-        return customers
+        return await run_in_threadpool(
+            _cached_json,
+            ("customers_simple", limit),
+            lambda: customer_service.get_customer_simple_records(limit=limit)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터 로드 오류: {str(e)}")
 
@@ -87,8 +115,11 @@ async def get_all_customers(
 ):
     """고객 목록 조회 (전체 정보)"""
     try:
-        customers = customer_service.get_all_customers(limit=limit)
-        return customers
+        return await run_in_threadpool(
+            _cached_json,
+            ("customers", limit),
+            lambda: customer_service.get_customer_records(limit=limit)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터 로드 오류: {str(e)}")
 
@@ -111,7 +142,7 @@ async def get_all_customers(
 async def get_customer_by_id(customer_id: str):
     """고객 ID로 조회"""
     try:
-        customer = customer_service.get_customer_by_id(customer_id)
+        customer = await run_in_threadpool(customer_service.get_customer_by_id, customer_id)
         if not customer:
             raise HTTPException(status_code=404, detail=f"고객 {customer_id}를 찾을 수 없습니다")
         return customer
@@ -141,8 +172,8 @@ async def filter_by_status(
 ):
     """상태별 필터링"""
     try:
-        customers = customer_service.filter_by_status(status)
-        return customers
+        customers = await run_in_threadpool(customer_service.filter_by_status, status)
+        return ORJSONResponse([c.model_dump() for c in customers])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"필터링 오류: {str(e)}")
 
@@ -167,8 +198,8 @@ async def filter_by_industry(
 ):
     """업종별 필터링"""
     try:
-        customers = customer_service.filter_by_industry(industry)
-        return customers
+        customers = await run_in_threadpool(customer_service.filter_by_industry, industry)
+        return ORJSONResponse([c.model_dump() for c in customers])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"필터링 오류: {str(e)}")
 
@@ -193,8 +224,8 @@ async def filter_by_churn_risk(
 ):
     """이탈 위험도별 필터링"""
     try:
-        customers = customer_service.filter_by_churn_risk(risk)
-        return customers
+        customers = await run_in_threadpool(customer_service.filter_by_churn_risk, risk)
+        return ORJSONResponse([c.model_dump() for c in customers])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"필터링 오류: {str(e)}")
 
@@ -236,8 +267,11 @@ async def filter_by_churn_risk(
 async def get_statistics():
     """전체 고객 통계"""
     try:
-        stats = customer_service.get_statistics()
-        return stats
+        return await run_in_threadpool(
+            _cached_json,
+            ("statistics_overview",),
+            lambda: customer_service.get_statistics().model_dump()
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"통계 계산 오류: {str(e)}")
 
@@ -273,7 +307,7 @@ async def get_statistics():
 async def get_industry_statistics():
     """업종별 통계"""
     try:
-        stats = customer_service.get_industry_statistics()
+        stats = await run_in_threadpool(customer_service.get_industry_statistics)
         return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"통계 계산 오류: {str(e)}")
@@ -301,8 +335,8 @@ async def get_top_customers(
 ):
     """상위 고객 조회"""
     try:
-        customers = customer_service.get_top_customers(limit=limit, by=by)
-        return customers
+        customers = await run_in_threadpool(customer_service.get_top_customers, limit, by)
+        return ORJSONResponse([c.model_dump() for c in customers])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터 조회 오류: {str(e)}")
 
@@ -330,7 +364,7 @@ async def get_top_customers(
 async def get_preprocess_info():
     """데이터 전처리 정보"""
     try:
-        info = customer_service.preprocess()
+        info = await run_in_threadpool(customer_service.preprocess)
         return info
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"전처리 오류: {str(e)}")
@@ -360,7 +394,7 @@ async def get_split_info(
 ):
     """학습/테스트 데이터 분할 정보"""
     try:
-        info = customer_service.split_data(test_size=test_size)
+        info = await run_in_threadpool(customer_service.split_data, test_size)
         return info
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터 분할 오류: {str(e)}")
@@ -404,7 +438,7 @@ async def get_split_info(
 async def train_model():
     """이탈 예측 모델 학습"""
     try:
-        result = customer_service.train_model()
+        result = await run_in_threadpool(customer_service.train_model)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"모델 학습 오류: {str(e)}")
@@ -453,7 +487,7 @@ async def train_model():
 async def predict_churn(customer_id: str):
     """고객 이탈 확률 예측"""
     try:
-        prediction = customer_service.predict_churn(customer_id)
+        prediction = await run_in_threadpool(customer_service.predict_churn, customer_id)
         return prediction
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -482,7 +516,7 @@ async def predict_churn(customer_id: str):
 async def get_huggingface_dataset():
     """HuggingFace Dataset 정보"""
     try:
-        dataset = customer_service.to_huggingface_dataset()
+        dataset = await run_in_threadpool(customer_service.to_huggingface_dataset)
         return {
             "num_rows": len(dataset),
             "num_columns": len(dataset.column_names),
@@ -517,7 +551,7 @@ async def get_huggingface_datasetdict(
 ):
     """HuggingFace DatasetDict 정보"""
     try:
-        dataset_dict = customer_service.to_huggingface_datasetdict(test_size=test_size)
+        dataset_dict = await run_in_threadpool(customer_service.to_huggingface_datasetdict, test_size)
         return {
             "train_size": len(dataset_dict['train']),
             "test_size": len(dataset_dict['test']),
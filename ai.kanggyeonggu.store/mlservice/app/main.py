@@ -4,7 +4,9 @@ ML Service - FastAPI 애플리케이션
 """
 import sys
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 # 공통 모듈 경로 추가
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -131,6 +133,19 @@ app = FastAPI(
 
 # 미들웨어 추가
 app.add_middleware(LoggingMiddleware)
+# 대용량 JSON/지도 HTML 응답 압축 (1KB 미만 소형 응답은 그대로 통과)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+# 전역 예외 핸들러: 라우트마다 try/except로 500을 만들 필요 없이 한 곳에서 처리
+# (핸들러 본문의 try 프레임 제거 + 스택 트레이스가 로그에 그대로 남음)
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    logger.exception(f"❌ 처리되지 않은 예외: {request.method} {request.url.path}")
+    return ORJSONResponse(
+        {"detail": f"{type(exc).__name__}: {exc}"},
+        status_code=500,
+    )
 
 # Titanic 라우터 추가
 app.include_router(titanic_router, prefix="/titanic")
@@ -210,6 +225,16 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     """서비스 시작 시 실행"""
+    import asyncio
+    from app.customer.router import customer_service
+
+    # 고객 데이터/인덱스를 미리 로드해 첫 요청의 콜드 스타트 비용 제거
+    # 실패해도 기동은 계속한다 (첫 요청 시 해당 엔드포인트에서 재시도)
+    try:
+        await asyncio.to_thread(customer_service.warmup)
+    except Exception as e:
+        logger.warning(f"⚠️ 고객 서비스 워밍업 실패 (첫 요청 시 재시도): {e}")
+
     logger.info(f"🚀 {config.service_name} v{config.service_version} started")
     logger.info(f"📚 API Documentation: http://localhost:{config.port}/docs")
     logger.info(f"🔍 Health Check: http://localhost:{config.port}/health")
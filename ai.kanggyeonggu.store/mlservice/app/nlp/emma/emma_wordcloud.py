@@ -1,6 +1,8 @@
 """
 NLTK 자연어 처리 서비스 클래스
 """
+import copy
+import functools
 import logging
 from typing import List, Tuple, Dict, Optional, Any
 import nltk
@@ -9,18 +11,61 @@ from nltk.stem import PorterStemmer, LancasterStemmer, WordNetLemmatizer
 from nltk.tag import pos_tag, untag
 from nltk import Text, FreqDist
 from wordcloud import WordCloud
+import matplotlib
+matplotlib.use("Agg")  # GUI 백엔드 탐색 생략 (서버에서는 화면 출력 없음)
 import matplotlib.pyplot as plt
 
 logger = logging.getLogger(__name__)
 
 
-def safe_execute(func, default=None, error_msg=""):
-    """안전한 함수 실행 헬퍼"""
-    try:
-        return func()
-    except Exception as e:
-        logger.error(f"{error_msg}: {e}")
-        return default if default is not None else ([] if isinstance(default, list) else "")
+# 프로세스당 1회만 NLTK 데이터 확인 (인스턴스마다 재확인 방지)
+_nltk_ready = False
+
+
+def _ensure_nltk_data():
+    """NLTK 데이터가 없을 때만 다운로드 (있으면 네트워크 체크 생략)"""
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    checks = [
+        ('corpora/gutenberg', 'book'),
+        ('tokenizers/punkt', 'punkt'),
+        ('corpora/wordnet', 'wordnet'),
+        ('taggers/averaged_perceptron_tagger', 'averaged_perceptron_tagger'),
+    ]
+    for resource, pkg in checks:
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            try:
+                nltk.download(pkg, quiet=True)
+            except:
+                pass
+    _nltk_ready = True
+
+
+@functools.lru_cache(maxsize=8)
+def _load_corpus_text_cached(corpus_name: str, fileid: str) -> str:
+    """말뭉치 텍스트를 프로세스 수명 동안 캐시 (요청마다 디스크 재독 방지)"""
+    return getattr(nltk.corpus, corpus_name).raw(fileid)
+
+
+def safe(default=None, error_msg=""):
+    """예외를 로깅하고 기본값을 반환하는 데코레이터 (호출당 람다/클로저 생성 제거)
+
+    default가 가변 객체(리스트 등)면 얕은 복사본을 반환해 호출마다
+    새 객체를 돌려준다 — 한 호출자가 폴백 결과를 수정해도 공유되지 않음.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"{error_msg}: {e}")
+                return copy.copy(default)
+        return wrapper
+    return decorator
 
 
 class NLPService:
@@ -30,97 +75,95 @@ class NLPService:
         """초기화"""
         self._download_nltk_data()
         self.regex_tokenizer = RegexpTokenizer(r"[\w]+")
+        # 패턴별 토크나이저 캐시 (호출마다 정규식 재컴파일 방지)
+        self._tok_cache: Dict[str, RegexpTokenizer] = {r"[\w]+": self.regex_tokenizer}
         self.porter_stemmer = PorterStemmer()
         self.lancaster_stemmer = LancasterStemmer()
         self.lemmatizer = WordNetLemmatizer()
+        # 핫루프에서 쓰는 바운드 메서드를 미리 참조 (호출당 속성 조회 제거)
+        self._stem_porter = self.porter_stemmer.stem
+        self._stem_lancaster = self.lancaster_stemmer.stem
+        self._lemmatize = self.lemmatizer.lemmatize
     
     def _download_nltk_data(self):
-        """NLTK 데이터 다운로드"""
-        for data in ['book', 'punkt', 'wordnet', 'averaged_perceptron_tagger']:
-            try:
-                nltk.download(data, quiet=True)
-            except:
-                pass
+        """NLTK 데이터 다운로드 (이미 있으면 건너뜀)"""
+        _ensure_nltk_data()
     
     # ========== 말뭉치 관리 ==========
+    @safe(default=[], error_msg="말뭉치 파일 ID 조회")
     def get_corpus_fileids(self, corpus_name: str = "gutenberg") -> List[str]:
         """말뭉치 파일 ID 목록 조회"""
-        return safe_execute(
-            lambda: getattr(nltk.corpus, corpus_name).fileids(),
-            default=[],
-            error_msg="말뭉치 파일 ID 조회"
-        )
-    
+        return getattr(nltk.corpus, corpus_name).fileids()
+
+    @safe(default="", error_msg="말뭉치 텍스트 로드")
     def load_corpus_text(self, corpus_name: str, fileid: str) -> str:
         """말뭉치에서 텍스트 로드"""
-        return safe_execute(
-            lambda: getattr(nltk.corpus, corpus_name).raw(fileid),
-            default="",
-            error_msg="말뭉치 텍스트 로드"
-        )
-    
+        return _load_corpus_text_cached(corpus_name, fileid)
+
     # ========== 토큰 생성 ==========
+    @safe(default=[], error_msg="문장 토큰 생성")
     def tokenize_sentences(self, text: str) -> List[str]:
         """문장 단위 토큰 생성"""
-        return safe_execute(lambda: sent_tokenize(text), default=[], error_msg="문장 토큰 생성")
-    
+        return sent_tokenize(text)
+
+    @safe(default=[], error_msg="단어 토큰 생성")
     def tokenize_words(self, text: str) -> List[str]:
         """단어 단위 토큰 생성"""
-        return safe_execute(lambda: word_tokenize(text), default=[], error_msg="단어 토큰 생성")
-    
+        return word_tokenize(text)
+
+    @safe(default=[], error_msg="정규식 토큰 생성")
     def tokenize_regex(self, text: str, pattern: str = r"[\w]+") -> List[str]:
         """정규식 기반 토큰 생성"""
-        return safe_execute(
-            lambda: RegexpTokenizer(pattern).tokenize(text),
-            default=[],
-            error_msg="정규식 토큰 생성"
-        )
+        tokenizer = self._tok_cache.setdefault(pattern, RegexpTokenizer(pattern))
+        return tokenizer.tokenize(text)
     
     # ========== 형태소 분석 ==========
     def stem_porter(self, words: List[str]) -> List[str]:
         """Porter Stemmer 어간 추출"""
-        return safe_execute(
-            lambda: [self.porter_stemmer.stem(w) for w in words],
-            default=[],
-            error_msg="Porter Stemming"
-        )
-    
+        try:
+            return list(map(self._stem_porter, words))
+        except Exception as e:
+            logger.error(f"Porter Stemming: {e}")
+            return []
+
     def stem_lancaster(self, words: List[str]) -> List[str]:
         """Lancaster Stemmer 어간 추출"""
-        return safe_execute(
-            lambda: [self.lancaster_stemmer.stem(w) for w in words],
-            default=[],
-            error_msg="Lancaster Stemming"
-        )
-    
+        try:
+            return list(map(self._stem_lancaster, words))
+        except Exception as e:
+            logger.error(f"Lancaster Stemming: {e}")
+            return []
+
     def lemmatize(self, words: List[str], pos: Optional[str] = None) -> List[str]:
         """원형 복원"""
-        return safe_execute(
-            lambda: [self.lemmatizer.lemmatize(w, pos=pos) if pos else self.lemmatizer.lemmatize(w) for w in words],
-            default=[],
-            error_msg="Lemmatization"
-        )
+        try:
+            lem = self._lemmatize
+            if pos is None:
+                return list(map(lem, words))
+            return [lem(w, pos=pos) for w in words]
+        except Exception as e:
+            logger.error(f"Lemmatization: {e}")
+            return []
     
     # ========== 품사 태깅 ==========
+    @safe(default=[], error_msg="품사 태깅")
     def pos_tag_text(self, text: str) -> List[Tuple[str, str]]:
         """텍스트 품사 태깅"""
-        return safe_execute(
-            lambda: pos_tag(word_tokenize(text)),
-            default=[],
-            error_msg="품사 태깅"
-        )
-    
+        return pos_tag(word_tokenize(text))
+
+    @safe(default=[], error_msg="품사 태깅")
     def pos_tag_tokens(self, tokens: List[str]) -> List[Tuple[str, str]]:
         """토큰 리스트 품사 태깅"""
-        return safe_execute(lambda: pos_tag(tokens), default=[], error_msg="품사 태깅")
-    
+        return pos_tag(tokens)
+
     def filter_by_pos(self, tagged_list: List[Tuple[str, str]], pos: str) -> List[str]:
         """특정 품사만 필터링"""
         return [word for word, tag in tagged_list if tag == pos]
-    
+
+    @safe(default=[], error_msg="태그 제거")
     def remove_tags(self, tagged_list: List[Tuple[str, str]]) -> List[str]:
         """품사 태그 제거"""
-        return safe_execute(lambda: untag(tagged_list), default=[], error_msg="태그 제거")
+        return untag(tagged_list)
     
     def create_pos_tokenizer(self, tagged_list: List[Tuple[str, str]]) -> List[str]:
         """품사 정보 포함 토크나이저 생성"""
@@ -137,91 +180,100 @@ class NLPService:
     # ========== Text 클래스 활용 ==========
     def create_text_object(self, tokens: List[str], name: str = "Text") -> Text:
         """NLTK Text 객체 생성"""
-        return safe_execute(
-            lambda: Text(tokens, name=name),
-            default=Text([], name=name),
-            error_msg="Text 객체 생성"
-        )
-    
+        try:
+            return Text(tokens, name=name)
+        except Exception as e:
+            logger.error(f"Text 객체 생성: {e}")
+            return Text([], name=name)
+
+    @safe(error_msg="단어 빈도 그래프")
     def plot_word_frequency(self, text: Text, num_words: int = 20):
         """단어 빈도 그래프"""
-        safe_execute(lambda: text.plot(num_words) or plt.show(), error_msg="단어 빈도 그래프")
-    
+        text.plot(num_words)
+        plt.show()
+
+    @safe(error_msg="분산도 그래프")
     def plot_dispersion(self, text: Text, words: List[str]):
         """단어 분산도 그래프"""
-        safe_execute(lambda: text.dispersion_plot(words), error_msg="분산도 그래프")
-    
+        text.dispersion_plot(words)
+
+    @safe(error_msg="Concordance 검색")
     def find_concordance(self, text: Text, word: str, lines: int = 5):
         """단어 사용 위치 찾기"""
-        safe_execute(lambda: text.concordance(word, lines=lines), error_msg="Concordance 검색")
-    
+        text.concordance(word, lines=lines)
+
+    @safe(error_msg="유사 단어 검색")
     def find_similar_words(self, text: Text, word: str, num: int = 10):
         """유사 단어 찾기"""
-        safe_execute(lambda: text.similar(word, num=num), error_msg="유사 단어 검색")
-    
+        text.similar(word, num=num)
+
+    @safe(error_msg="연어 검색")
     def find_collocations(self, text: Text, num: int = 10):
         """연어 찾기"""
-        safe_execute(lambda: text.collocations(num=num), error_msg="연어 검색")
-    
+        text.collocations(num=num)
+
     # ========== FreqDist 활용 ==========
     def create_freq_dist(self, tokens: List[str]) -> FreqDist:
         """빈도 분포 객체 생성"""
-        return safe_execute(
-            lambda: FreqDist(tokens),
-            default=FreqDist([]),
-            error_msg="FreqDist 생성"
-        )
-    
+        try:
+            return FreqDist(tokens)
+        except Exception as e:
+            logger.error(f"FreqDist 생성: {e}")
+            return FreqDist([])
+
     def get_freq_stats(self, freq_dist: FreqDist, word: str) -> Dict[str, Any]:
         """단어 빈도 통계 조회"""
-        return safe_execute(
-            lambda: {
+        try:
+            return {
                 "total_words": freq_dist.N(),
                 "word_count": freq_dist[word],
                 "word_frequency": freq_dist.freq(word)
-            },
-            default={"total_words": 0, "word_count": 0, "word_frequency": 0.0},
-            error_msg="빈도 통계 조회"
-        )
-    
+            }
+        except Exception as e:
+            logger.error(f"빈도 통계 조회: {e}")
+            return {"total_words": 0, "word_count": 0, "word_frequency": 0.0}
+
+    @safe(default=[], error_msg="가장 빈번한 단어 조회")
     def get_most_common(self, freq_dist: FreqDist, num: int = 10) -> List[Tuple[str, int]]:
         """가장 빈번한 단어 조회"""
-        return safe_execute(
-            lambda: freq_dist.most_common(num),
-            default=[],
-            error_msg="가장 빈번한 단어 조회"
-        )
+        return freq_dist.most_common(num)
     
-    def extract_names_from_text(self, text: str, stopwords: Optional[List[str]] = None) -> FreqDist:
-        """텍스트에서 고유명사 추출 및 빈도 분석"""
+    def extract_names_from_text(
+        self, text: str, stopwords: Optional[List[str]] = None,
+        tokens: Optional[List[str]] = None
+    ) -> FreqDist:
+        """텍스트에서 고유명사 추출 및 빈도 분석 (tokens를 주면 재토큰화 생략)"""
         if stopwords is None:
             stopwords = ["Mr.", "Mrs.", "Miss", "Mr", "Mrs", "Dear"]
-        return safe_execute(
-            lambda: self.create_freq_dist([
-                word for word, tag in self.pos_tag_tokens(self.regex_tokenizer.tokenize(text))
-                if tag == "NNP" and word not in stopwords
-            ]),
-            default=FreqDist([]),
-            error_msg="고유명사 추출"
-        )
+        stopset = frozenset(stopwords)
+        try:
+            # 토큰화 1회 → 태깅 1회 → 단일 패스 필터
+            if tokens is None:
+                tokens = self.regex_tokenizer.tokenize(text)
+            tagged = pos_tag(tokens)
+            names = [word for word, tag in tagged
+                     if tag == "NNP" and word not in stopset]
+            return FreqDist(names)
+        except Exception as e:
+            logger.error(f"고유명사 추출: {e}")
+            return FreqDist([])
     
     # ========== 워드클라우드 ==========
+    @safe(default=None, error_msg="워드클라우드 생성")
     def generate_wordcloud(
         self, freq_dist: FreqDist, width: int = 1000, height: int = 600,
         background_color: str = "white", random_state: int = 0
     ) -> Optional[WordCloud]:
         """워드클라우드 생성"""
-        return safe_execute(
-            lambda: WordCloud(width=width, height=height, background_color=background_color, random_state=random_state)
-            .generate_from_frequencies(freq_dist),
-            default=None,
-            error_msg="워드클라우드 생성"
-        )
-    
-    def plot_wordcloud(self, wordcloud: WordCloud):
-        """워드클라우드 시각화"""
-        if wordcloud:
-            safe_execute(
-                lambda: plt.imshow(wordcloud) or plt.axis("off") or plt.show(),
-                error_msg="워드클라우드 시각화"
-            )
+        return WordCloud(
+            width=width, height=height, background_color=background_color,
+            random_state=random_state
+        ).generate_from_frequencies(freq_dist)
+
+    @safe(error_msg="워드클라우드 시각화")
+    def plot_wordcloud(self, wordcloud: WordCloud, show: bool = False):
+        """워드클라우드 시각화 (API 경로에서는 show=False로 렌더링 생략)"""
+        if wordcloud and show:
+            plt.imshow(wordcloud)
+            plt.axis("off")
+            plt.show()
@@ -5,14 +5,19 @@ NLP Router - FastAPI 라우터
 from typing import Dict, Any, Optional
 from pathlib import Path
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 import base64
+import hashlib
 import io
+import json
 import logging
+import pickle
 from datetime import datetime
 from app.nlp.emma.emma_wordcloud import NLPService
 from app.nlp.samsung.samsung_wordcloud import SamusungWordcloud
 from nltk import FreqDist
+from wordcloud import WordCloud
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +46,183 @@ def get_samsung_wordcloud_service():
     return _samsung_wordcloud_service
 
 
+# Emma 고유명사 FreqDist 캐시 (말뭉치는 읽기 전용이라 프로세스당 1회 계산)
+_emma_freq_cache: Dict[str, Any] = {}
+
+
+def _get_emma_freq_dist() -> Any:
+    """Emma 고유명사 빈도 분포 계산 (캐시됨)"""
+    freq_dist = _emma_freq_cache.get("austen-emma.txt")
+    if freq_dist is not None:
+        return freq_dist
+
+    # 1. Emma 말뭉치 로드
+    emma_raw = nlp_service.load_corpus_text("gutenberg", "austen-emma.txt")
+    if not emma_raw:
+        raise HTTPException(status_code=404, detail="Emma 말뭉치를 찾을 수 없습니다.")
+
+    # 2. 토큰화는 1회만 수행해 고유명사 추출과 폴백 경로가 공유
+    tokens = nlp_service.tokenize_regex(emma_raw)
+
+    # 3. 고유명사 추출 및 빈도 분석
+    logger.info("고유명사 추출 시작...")
+    freq_dist = nlp_service.extract_names_from_text(emma_raw, tokens=tokens)
+    logger.info(f"고유명사 추출 완료: 총 {freq_dist.N()}개, 고유 {len(freq_dist)}개")
+
+    # 빈도 분포 확인
+    if freq_dist.N() == 0 or len(freq_dist) == 0:
+        logger.warning("고유명사가 추출되지 않았습니다. 전체 단어로 워드클라우드 생성 시도...")
+        # 고유명사가 없으면 이미 토큰화된 전체 단어로 시도 (재토큰화 없음)
+        freq_dist = nlp_service.create_freq_dist(tokens)
+        logger.info(f"전체 단어 빈도 분포: 총 {freq_dist.N()}개, 고유 {len(freq_dist)}개")
+
+    _emma_freq_cache["austen-emma.txt"] = freq_dist
+    return freq_dist
+
+
+def _build_emma_wordcloud(width: int, height: int, background_color: str) -> Dict[str, Any]:
+    """Emma 워드클라우드 파이프라인 (동기 CPU 작업 — 스레드풀에서 실행)"""
+    save_path = Path(__file__).parent / "save"
+    save_path.mkdir(parents=True, exist_ok=True)
+
+    # 설정 조합별 디스크 캐시: 동일한 (크기, 배경색) 요청은 저장본 재사용
+    key = hashlib.sha1(f"emma:{width}x{height}:{background_color}".encode()).hexdigest()
+    png_cache = save_path / f"emma_{key}.png"
+    meta_cache = save_path / f"emma_{key}.json"
+    if png_cache.exists() and meta_cache.exists():
+        logger.info(f"캐시된 워드클라우드 반환: {png_cache}")
+        content = json.loads(meta_cache.read_text(encoding='utf-8'))
+        img_base64 = base64.b64encode(png_cache.read_bytes()).decode('ascii')
+        content["image"] = f"data:image/png;base64,{img_base64}"
+        return content
+
+    freq_dist = _get_emma_freq_dist()
+
+    if freq_dist.N() == 0 or len(freq_dist) == 0:
+        raise HTTPException(
+            status_code=500, 
+            detail="빈도 분포 데이터가 없어 워드클라우드를 생성할 수 없습니다."
+        )
+    
+    # 4. 워드클라우드 생성 — 사각형 패킹 레이아웃은 (빈도, 크기, random_state)로
+    # 결정되고 배경색과는 무관하므로, 피클해 두고 배경색만 다른 요청에 재사용
+    layout_key = hashlib.sha1(
+        repr((freq_dist.most_common(200), width, height, 0)).encode()
+    ).hexdigest()
+    layout_cache = save_path / f"emma_layout_{layout_key}.pkl"
+
+    wordcloud = None
+    if layout_cache.exists():
+        try:
+            with open(layout_cache, 'rb') as f:
+                layout = pickle.load(f)
+            wordcloud = WordCloud(
+                width=width, height=height,
+                background_color=background_color, random_state=0
+            )
+            wordcloud.layout_ = layout
+            logger.info(f"캐시된 레이아웃 재사용: {layout_cache}")
+        except Exception as e:
+            logger.warning(f"레이아웃 캐시 로드 실패, 재생성: {e}")
+            wordcloud = None
+
+    if wordcloud is None:
+        logger.info("워드클라우드 생성 시작...")
+        try:
+            wordcloud = nlp_service.generate_wordcloud(
+                freq_dist=freq_dist,
+                width=width,
+                height=height,
+                background_color=background_color,
+                random_state=0
+            )
+        except Exception as e:
+            logger.error(f"워드클라우드 생성 중 예외 발생: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            raise HTTPException(
+                status_code=500,
+                detail=f"워드클라우드 생성 중 오류 발생: {str(e)}"
+            )
+
+        if wordcloud:
+            try:
+                with open(layout_cache, 'wb') as f:
+                    pickle.dump(wordcloud.layout_, f)
+            except Exception as e:
+                logger.warning(f"레이아웃 캐시 저장 실패: {e}")
+
+    if not wordcloud:
+        logger.error("워드클라우드 객체가 None입니다.")
+        raise HTTPException(
+            status_code=500, 
+            detail="워드클라우드 생성에 실패했습니다. (wordcloud 객체가 None)"
+        )
+    
+    logger.info("워드클라우드 생성 완료")
+    
+    # 5. PNG 인코딩 1회 수행 (같은 바이트를 파일 저장과 응답에 공유)
+    img_buffer = io.BytesIO()
+    # compress_level=1: 요청 시마다 재생성되는 이미지라 빠른 zlib 압축 사용
+    wordcloud.to_image().save(img_buffer, format='PNG', optimize=False, compress_level=1)
+    png_bytes = img_buffer.getvalue()
+
+    # 6. save 폴더에 이미지 저장 (덮어쓰기 방식) 및 Base64 인코딩
+    # 고정된 파일명 사용 (기존 파일이 있으면 덮어쓰기)
+    filename = "emma_wordcloud.png"
+    file_path = save_path / filename
+
+    # 기존 파일 확인 로그
+    if file_path.exists():
+        logger.info(f"기존 파일 발견. 덮어쓰기: {file_path}")
+    else:
+        logger.info(f"새 파일 생성: {file_path}")
+
+    # 이미지 저장 (덮어쓰기)
+    try:
+        file_path.write_bytes(png_bytes)
+        logger.info(f"워드클라우드 저장 완료: {file_path}")
+    except Exception as e:
+        logger.error(f"워드클라우드 저장 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=f"파일 저장 중 오류 발생: {str(e)}")
+
+    img_base64 = base64.b64encode(png_bytes).decode('ascii')
+    
+    # 7. 통계 정보 수집
+    most_common = nlp_service.get_most_common(freq_dist, num=10)
+
+    content = {
+        "success": True,
+        "message": "Emma 워드클라우드 생성 및 저장 완료",
+        "image": f"data:image/png;base64,{img_base64}",
+        "file_path": str(file_path),
+        "file_name": filename,
+        "statistics": {
+            "total_names": freq_dist.N(),
+            "unique_names": len(freq_dist),
+            "top_10_names": [
+                {"name": name, "count": count} 
+                for name, count in most_common
+            ]
+        },
+        "settings": {
+            "width": width,
+            "height": height,
+            "background_color": background_color
+        }
+    }
+
+    # 8. 디스크 캐시 저장 (이미지 본문은 제외한 메타데이터 + PNG)
+    try:
+        png_cache.write_bytes(png_bytes)
+        meta = {k: v for k, v in content.items() if k != "image"}
+        meta_cache.write_text(json.dumps(meta, ensure_ascii=False), encoding='utf-8')
+    except Exception as e:
+        logger.warning(f"워드클라우드 캐시 저장 실패: {e}")
+
+    return content
+
+
 @router.get(
     "/emma",
     summary="Emma 워드클라우드 생성",
@@ -63,113 +245,12 @@ async def create_emma_wordcloud(
         워드클라우드 이미지 (Base64 인코딩) 및 메타데이터
     """
     try:
-        # 1. Emma 말뭉치 로드
-        emma_raw = nlp_service.load_corpus_text("gutenberg", "austen-emma.txt")
-        if not emma_raw:
-            raise HTTPException(status_code=404, detail="Emma 말뭉치를 찾을 수 없습니다.")
-        
-        # 2. 텍스트 토큰화
-        tokens = nlp_service.tokenize_regex(emma_raw)
-        
-        # 3. 고유명사 추출 및 빈도 분석
-        logger.info("고유명사 추출 시작...")
-        freq_dist = nlp_service.extract_names_from_text(emma_raw)
-        logger.info(f"고유명사 추출 완료: 총 {freq_dist.N()}개, 고유 {len(freq_dist)}개")
-        
-        # 빈도 분포 확인
-        if freq_dist.N() == 0 or len(freq_dist) == 0:
-            logger.warning("고유명사가 추출되지 않았습니다. 전체 단어로 워드클라우드 생성 시도...")
-            # 고유명사가 없으면 전체 단어로 시도
-            tokens = nlp_service.tokenize_regex(emma_raw)
-            freq_dist = nlp_service.create_freq_dist(tokens)
-            logger.info(f"전체 단어 빈도 분포: 총 {freq_dist.N()}개, 고유 {len(freq_dist)}개")
-        
-        if freq_dist.N() == 0 or len(freq_dist) == 0:
-            raise HTTPException(
-                status_code=500, 
-                detail="빈도 분포 데이터가 없어 워드클라우드를 생성할 수 없습니다."
-            )
-        
-        # 4. 워드클라우드 생성
-        logger.info("워드클라우드 생성 시작...")
-        try:
-            wordcloud = nlp_service.generate_wordcloud(
-                freq_dist=freq_dist,
-                width=width,
-                height=height,
-                background_color=background_color,
-                random_state=0
-            )
-        except Exception as e:
-            logger.error(f"워드클라우드 생성 중 예외 발생: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            raise HTTPException(
-                status_code=500, 
-                detail=f"워드클라우드 생성 중 오류 발생: {str(e)}"
-            )
-        
-        if not wordcloud:
-            logger.error("워드클라우드 객체가 None입니다.")
-            raise HTTPException(
-                status_code=500, 
-                detail="워드클라우드 생성에 실패했습니다. (wordcloud 객체가 None)"
-            )
-        
-        logger.info("워드클라우드 생성 완료")
-        
-        # 5. save 폴더에 이미지 저장 (덮어쓰기 방식)
-        save_path = Path(__file__).parent / "save"
-        save_path.mkdir(parents=True, exist_ok=True)
-        
-        # 고정된 파일명 사용 (기존 파일이 있으면 덮어쓰기)
-        filename = "emma_wordcloud.png"
-        file_path = save_path / filename
-        
-        # 기존 파일 확인 로그
-        if file_path.exists():
-            logger.info(f"기존 파일 발견. 덮어쓰기: {file_path}")
-        else:
-            logger.info(f"새 파일 생성: {file_path}")
-        
-        # 이미지 저장 (덮어쓰기)
-        try:
-            wordcloud.to_file(str(file_path))
-            logger.info(f"워드클라우드 저장 완료: {file_path}")
-        except Exception as e:
-            logger.error(f"워드클라우드 저장 중 오류: {e}")
-            raise HTTPException(status_code=500, detail=f"파일 저장 중 오류 발생: {str(e)}")
-        
-        # 6. 이미지를 Base64로 인코딩
-        img_buffer = io.BytesIO()
-        wordcloud.to_image().save(img_buffer, format='PNG')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
-        
-        # 7. 통계 정보 수집
-        most_common = nlp_service.get_most_common(freq_dist, num=10)
-        
-        return JSONResponse(content={
-            "success": True,
-            "message": "Emma 워드클라우드 생성 및 저장 완료",
-            "image": f"data:image/png;base64,{img_base64}",
-            "file_path": str(file_path),
-            "file_name": filename,
-            "statistics": {
-                "total_names": freq_dist.N(),
-                "unique_names": len(freq_dist),
-                "top_10_names": [
-                    {"name": name, "count": count} 
-                    for name, count in most_common
-                ]
-            },
-            "settings": {
-                "width": width,
-                "height": height,
-                "background_color": background_color
-            }
-        })
-        
+        # POS 태깅/PNG 인코딩 등 무거운 동기 작업을 스레드풀로 넘겨
+        # 이벤트 루프가 다른 요청을 계속 처리할 수 있게 함
+        content = await run_in_threadpool(
+            _build_emma_wordcloud, width, height, background_color
+        )
+        return JSONResponse(content=content)
     except HTTPException:
         raise
     except Exception as e:
@@ -195,14 +276,14 @@ async def create_samsung_wordcloud() -> Dict[str, Any]:
         logger.info("삼성 워드클라우드 생성 시작...")
         
         # 서비스 지연 초기화 (첫 호출 시에만 Java JVM 시작)
-        service = get_samsung_wordcloud_service()
+        service = await run_in_threadpool(get_samsung_wordcloud_service)
         
         # 1. 워드클라우드 생성 및 저장
-        file_path = service.draw_wordcloud()
+        file_path = await run_in_threadpool(service.draw_wordcloud)
         logger.info(f"워드클라우드 저장 완료: {file_path}")
         
         # 2. 빈도 분석
-        freq_txt = service.find_freq()
+        freq_txt = await run_in_threadpool(service.find_freq)
         
         # 3. 상위 30개 단어 추출
         top_words = []
@@ -1,5 +1,6 @@
 import logging
 import re
+from functools import lru_cache
 from typing import List, Tuple, Dict, Optional, Any
 from pathlib import Path
 import pandas as pd
@@ -9,97 +10,125 @@ from nltk.stem import PorterStemmer, LancasterStemmer, WordNetLemmatizer
 from nltk.tag import pos_tag, untag
 from nltk import Text, FreqDist
 from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 from konlpy.tag import Okt
 
 logger = logging.getLogger(__name__)
 
+# 프로세스당 1회만 NLTK 데이터 확인 (인스턴스마다 재확인 방지)
+_nltk_ready = False
+
+
+@lru_cache(maxsize=1)
+def _get_okt():
+    """프로세스 공유 Okt 인스턴스 (JVM·사전 로딩은 프로세스당 1회)
+
+    JVM은 프로세스 전역이라 동시 요청이 같은 인스턴스를 공유한다.
+    워밍업 호출로 지연 로딩되는 사전을 미리 올려 첫 요청 지연을 줄임.
+    """
+    okt = Okt()
+    okt.pos("삼성전자 글로벌센터 전자사업부", stem=True)
+    return okt
+
 
 class SamusungWordcloud:
         
     def __init__(self):
         self._download_nltk_data()
-        self.okt = Okt()
+        self.okt = _get_okt()
+        self._noun_texts = None
+        self._cached_texts = None
+        self._han_re = re.compile(r'[^ ㄱ-ㅣ가-힣]+')  #한글 외 문자 제거 패턴 (1회 컴파일)
     
     def _download_nltk_data(self):
-        """NLTK 데이터 다운로드"""
-        nltk_data_list = ['punkt_tab', 'punkt', 'wordnet', 'averaged_perceptron_tagger']
-        for data in nltk_data_list:
+        """NLTK 데이터 다운로드 (이미 있으면 건너뜀)"""
+        global _nltk_ready
+        if _nltk_ready:
+            return
+        checks = [
+            # punkt/punkt_tab은 공백 분리 토큰화로 전환하며 더 이상 필요 없음
+            ('corpora/wordnet', 'wordnet'),
+            ('taggers/averaged_perceptron_tagger', 'averaged_perceptron_tagger'),
+        ]
+        for resource, data in checks:
             try:
-                nltk.download(data, quiet=True)
-            except Exception as e:
-                logger.warning(f"NLTK 데이터 '{data}' 다운로드 중 경고: {e}")
+                nltk.data.find(resource)
+            except LookupError:
+                try:
+                    nltk.download(data, quiet=True)
+                except Exception as e:
+                    logger.warning(f"NLTK 데이터 '{data}' 다운로드 중 경고: {e}")
+        _nltk_ready = True
 
     #자연어 처리리
     def text_process(self):
-        freq_txt = self.find_freq()
-        self.find_freq()    
-        self.draw_wordcloud()    
+        # 토큰화 결과를 한 번만 계산해 빈도 분석과 워드클라우드에 공유
+        texts = self.remove_stopword()
+        freq_txt = self.find_freq(texts)
+        self.draw_wordcloud(texts)
         return {
             '전처리 결과 ' : '완료',
             'freq_txt' : freq_txt,
         }
 
-    def read_file(self):
-        #은,는,이,가가 등등 빼고 어간만 남김
-        self.okt.pos("삼성전자 글로벌센터 전자사업부", stem=True)
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def read_file():
+        """보고서 텍스트 로드 (프로세스당 1회, 바이너리 읽기 후 단일 디코드)"""
         fname = Path(__file__).parent.parent / "data" / "kr-Report_2018.txt"
-        with open(fname, 'r', encoding='utf-8') as f:
-            text = f.read()
-        return text
+        return fname.read_bytes().decode('utf-8')
     
     def extract_nouns(self, text : str):
-        temp = text.replace('\n', ' ') #줄바꿈 빼고
-        tokenizer = re.compile(r'[^ ㄱ-ㅣ가-힣]+') #한글 외 모든 문자 제거 +한글자 이상.
-        return tokenizer.sub('', temp)
+        #줄바꿈을 공백으로 바꾼 뒤 한글 외 모든 문자를 단일 sub로 제거
+        return self._han_re.sub('', text.replace('\n', ' '))
 
     def change_token(self, texts):
-        return word_tokenize(texts)
+        # 한글+공백만 남은 텍스트라 Punkt/Treebank 토크나이저 없이 공백 분리로 충분
+        return texts.split()
 
     def extract_noun(self):
         # 삼성전자의 스마트폰은 -> 삼성전자 스마트폰
-        noun_tokens = []
-        tokens = self.change_token(self.extract_nouns(self.read_file()))
-        for i in tokens:
-            pos = self.okt.pos(i)
-            temp = [j[0] for j in pos if j[1] == 'Noun']
-            #띄워쓰기 
-            if len(''.join(temp)) > 1 :
-                noun_tokens.append(''.join(temp))
+        if self._noun_texts is not None:
+            return self._noun_texts
+        # 전체 텍스트를 단일 okt.pos 호출로 태깅 (JVM 왕복 1회)한 뒤
+        # 명사 태그 + 두 글자 이상만 파이썬 쪽에서 걸러냄
+        tagged = self.okt.pos(self.extract_nouns(self.read_file()), norm=True, stem=False)
+        noun_tokens = [w for w, t in tagged if t == 'Noun' and len(w) > 1]
         texts = ' '.join(noun_tokens)
         logger.info(texts[:100]) #콘솔에 100번째 단어까지 출력
+        self._noun_texts = texts
         return texts
 
-    def read_stopword(self):
-        self.okt.pos("삼성전자 글로벌센터 전자사업부", stem=True)
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def read_stopword():
+        """불용어를 frozenset으로 로드 (토큰 필터가 O(1) 해시 조회가 됨)"""
         fname = Path(__file__).parent.parent / "data" / "stopwords.txt"
-        with open(fname, 'r', encoding='utf-8') as f:
-            stopwords = f.read()
-        return stopwords
+        return frozenset(fname.read_bytes().decode('utf-8').split())
 
     def remove_stopword(self):
+        if self._cached_texts is not None:
+            return self._cached_texts
         texts = self.extract_noun()
         tokens = self.change_token(texts)
-        # print('------- 1 명사 -------')
-        # print(texts[:30])
         stopwords = self.read_stopword()
-        # print('------- 2 스톱 -------')
-        # print(stopwords[:30])
-        # print('------- 3 필터 -------')
-        texts = [text for text in tokens
-                 if text not in stopwords]
-        # print(texts[:30])
+        # isin은 C 레벨 해시 조회라 파이썬 루프의 토큰별 `in`보다 빠름
+        s = pd.Series(tokens, dtype="string")
+        texts = s[~s.isin(stopwords)].tolist()
+        self._cached_texts = texts
         return texts
 
-    def find_freq(self):
-        texts = self.remove_stopword()
-        freqtxt = pd.Series(dict(FreqDist(texts))).sort_values(ascending=False)
-        logger.info(freqtxt[:30])
+    def find_freq(self, texts=None):
+        if texts is None:
+            texts = self.remove_stopword()
+        # value_counts는 집계+내림차순 정렬을 C 레벨 단일 패스로 수행
+        freqtxt = pd.Series(texts).value_counts()
+        logger.info(freqtxt.head(30))
         return freqtxt
 
-    def draw_wordcloud(self):
+    def draw_wordcloud(self, texts=None):
         """워드클라우드 생성"""
-        texts = self.remove_stopword()
+        if texts is None:
+            texts = self.remove_stopword()
         
         # save 폴더 경로 설정
         save_path = Path(__file__).parent.parent / "save"
@@ -123,18 +152,12 @@ class SamusungWordcloud:
         else:
             logger.info(f"새 파일 생성: {file_path}")
         
-        # 이미지 저장 (덮어쓰기)
+        # 이미지 저장 (덮어쓰기) — to_file이 PIL로 PNG를 쓰므로 별도 시각화 불필요
         try:
             wcloud.to_file(str(file_path))
             logger.info(f"워드클라우드 저장 완료: {file_path}")
         except Exception as e:
             logger.error(f"워드클라우드 저장 중 오류: {e}")
             raise
-        
-        # 시각화 (선택사항)
-        plt.figure(figsize=(12, 12))
-        plt.imshow(wcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.close()  # plt.show() 대신 close()로 메모리 해제
-        
+
         return str(file_path)
\ No newline at end of file
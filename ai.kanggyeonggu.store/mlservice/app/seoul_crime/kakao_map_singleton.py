@@ -1,11 +1,35 @@
 import os
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
 import requests
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# 지오코딩 디스크 캐시 유효 기간 (경찰서 위치는 사실상 불변)
+_GEOCODE_CACHE_TTL = 30 * 86400
+
+# 행정구역 토큰(…구/…시/…도)을 한 번의 스캔으로 찾는 패턴과 타입 매핑
+_ADMIN_RE = re.compile(r'([가-힣]+)(구|시|도)\b')
+_ADMIN_TYPES = {
+    '구': ["sublocality_level_1", "administrative_area_level_2"],
+    '시': ["administrative_area_level_1"],
+    '도': ["administrative_area_level_1"],
+}
+
+
+def _normalize_query(address: str) -> str:
+    """캐시 키용 질의 정규화 (NFC + 소문자 + 공백 제거)"""
+    return unicodedata.normalize("NFC", str(address)).lower().replace(" ", "")
+
 
 class KakaoMapSingleton:
     """카카오맵 API 싱글톤 클래스"""
@@ -19,10 +43,63 @@ class KakaoMapSingleton:
             cls._instance = super(KakaoMapSingleton, cls).__new__(cls)
             cls._instance._api_key = cls._instance._retrieve_api_key()  # API 키 가져오기
             cls._instance._base_url = "https://dapi.kakao.com/v2/local"
+            # keep-alive 세션: 주소마다 TCP+TLS 핸드셰이크를 반복하지 않도록
+            # 커넥션 풀과 재시도 정책을 세션에 한 번만 설정
+            session = requests.Session()
+            session.headers.update({"Authorization": f"KakaoAK {cls._instance._api_key}"})
+            session.mount("https://", HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=32,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                ),
+            ))
+            cls._instance._session = session
+            # 디스크 지오코딩 캐시 로드: 동일 질의는 API 호출 없이 응답
+            cls._instance._cache_path = Path(__file__).parent / "save" / ".geocode_cache.json"
+            cls._instance._geocode_cache = cls._instance._load_geocode_cache()
+            # preprocess가 8개 워커 스레드에서 geocode를 동시에 호출하므로
+            # 캐시 갱신+저장은 락으로 직렬화
+            cls._instance._cache_lock = threading.Lock()
         return cls._instance  # 기존 인스턴스 반환
 
+    def _load_geocode_cache(self):
+        """저장된 지오코딩 캐시 로드 (없거나 손상되면 빈 캐시)"""
+        try:
+            if self._cache_path.exists():
+                cache = json.loads(self._cache_path.read_text(encoding='utf-8'))
+                logger.info(f"지오코딩 캐시 로드: {len(cache)}건")
+                return cache
+        except Exception as e:
+            logger.warning(f"지오코딩 캐시 로드 실패 (새로 시작): {e}")
+        return {}
+
+    def _save_geocode_cache(self):
+        """지오코딩 캐시를 디스크에 저장 (_cache_lock을 잡은 상태에서 호출)
+
+        임시 파일에 쓴 뒤 os.replace로 원자적 교체 — 쓰기 도중 중단돼도
+        읽는 쪽이 잘린 JSON을 보지 않음.
+        """
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._cache_path.with_suffix('.json.tmp')
+            tmp_path.write_text(
+                json.dumps(self._geocode_cache, ensure_ascii=False), encoding='utf-8'
+            )
+            os.replace(tmp_path, self._cache_path)
+        except Exception as e:
+            logger.warning(f"지오코딩 캐시 저장 실패: {e}")
+
     def _retrieve_api_key(self):
-        """루트 .env 파일에서 API 키 가져오기"""
+        """환경 변수 우선으로 API 키 가져오기 (없을 때만 .env 탐색)"""
+        # 컨테이너/배포 환경은 키를 환경 변수로 직접 주입하므로
+        # 디렉토리를 거슬러 올라가는 stat() 탐색을 건너뜀
+        api_key = os.getenv("KAKAO_REST_API_KEY") or os.getenv("KAKAO_MAP_API_KEY")
+        if api_key:
+            return api_key
+
         # .env 파일을 한 번만 로드
         if not KakaoMapSingleton._env_loaded:
             # 프로젝트 루트 경로 찾기 (현재 파일에서 상위로 올라가서 .env 파일 찾기)
@@ -51,18 +128,25 @@ class KakaoMapSingleton:
 
     def geocode(self, address, language='ko'):
         """주소를 위도, 경도로 변환하는 메서드 (카카오 맵 API)"""
+        # 디스크 캐시 조회: 같은 질의는 API 쿼터를 쓰지 않고 즉시 반환
+        cache_key = hashlib.sha1(
+            f"{_normalize_query(address)}|{language}".encode()
+        ).hexdigest()
+        entry = self._geocode_cache.get(cache_key)
+        if entry and time.time() - entry.get('ts', 0) < _GEOCODE_CACHE_TTL:
+            logger.info(f"💾 지오코딩 캐시 적중: {address}")
+            return entry['result']
+
         # 키워드 검색 API 사용 (장소명 검색용)
         url = f"{self._base_url}/search/keyword.json"
-        headers = {
-            "Authorization": f"KakaoAK {self._api_key}"
-        }
         params = {
             "query": address
         }
-        
+
         logger.info(f"🔍 카카오 맵 API 호출 시작: {address}")
         try:
-            response = requests.get(url, headers=headers, params=params)
+            # 인증 헤더는 세션에 설정되어 있고, 커넥션은 풀에서 재사용됨
+            response = self._session.get(url, params=params, timeout=(3, 5))
             
             # 에러 응답 처리
             if response.status_code == 403:
@@ -84,7 +168,7 @@ class KakaoMapSingleton:
                 lat = float(doc.get('y', 0))
                 lng = float(doc.get('x', 0))
                 logger.info(f"✅ 카카오 맵 API 성공: {address} → {address_name} (위도: {lat}, 경도: {lng})")
-                return [{
+                geocode_result = [{
                     "formatted_address": address_name,
                     "geometry": {
                         "location": {
@@ -93,6 +177,11 @@ class KakaoMapSingleton:
                         }
                     }
                 }]
+                # 성공 결과만 캐시 (빈 결과는 재시도 여지를 남김)
+                with self._cache_lock:
+                    self._geocode_cache[cache_key] = {'ts': time.time(), 'result': geocode_result}
+                    self._save_geocode_cache()
+                return geocode_result
             logger.warning(f"⚠️ 카카오 맵 API 결과 없음: {address}")
             return []
             
@@ -115,24 +204,18 @@ class KakaoMapSingleton:
         """
         components = []
         address_name = doc.get("address_name", "")
-        
+
         if not address_name:
             return components
-        
-        parts = address_name.split()
-        for part in parts:
-            if part.endswith("구"):
-                components.append({
-                    "long_name": part,
-                    "short_name": part,
-                    "types": ["sublocality_level_1", "administrative_area_level_2"]
-                })
-            elif part.endswith("시") or part.endswith("도"):
-                components.append({
-                    "long_name": part,
-                    "short_name": part,
-                    "types": ["administrative_area_level_1"]
-                })
-        
+
+        # split + 토큰별 endswith 3회 대신 컴파일된 패턴 단일 스캔으로 분류
+        for m in _ADMIN_RE.finditer(address_name):
+            part = m.group(0)
+            components.append({
+                "long_name": part,
+                "short_name": part,
+                "types": list(_ADMIN_TYPES[m.group(2)])
+            })
+
         return components
 
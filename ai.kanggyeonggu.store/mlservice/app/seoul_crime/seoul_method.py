@@ -1,6 +1,7 @@
 import logging
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from pathlib import Path
 from pandas import DataFrame
 from app.seoul_crime.seoul_dataset import SeoulDataset
@@ -9,13 +10,78 @@ import re
 
 logger = logging.getLogger(__name__)
 
-class SeoulMethod(object): 
+# 주소 문자열에서 자치구명을 뽑는 공용 패턴 (모듈 로드 시 1회 컴파일)
+GU_RE = re.compile(r'([가-힣]+구)\b')
+
+# "서"→"구" 규칙이 틀리는 관서명 예외 테이블 (카카오 API 폴백 불필요)
+_STATION_DISTRICT_OVERRIDES = {
+    "중부서": "중구",
+    "남대문서": "중구",
+    "혜화서": "종로구",
+    "서부서": "은평구",
+    "종암서": "성북구",
+    "수서서": "강남구",
+    "방배서": "서초구",
+}
+
+
+# 파일 파싱 캐시: (경로, mtime_ns)를 키로 프로세스 수명 동안 재사용.
+# 파일이 바뀌면 mtime이 달라져 자동으로 새로 읽음.
+@lru_cache(maxsize=16)
+def _read_csv_cached(path_str: str, mtime_ns: int) -> pd.DataFrame:
+    try:
+        # 멀티스레드 pyarrow 파서 (기본 C 파서 대비 수 배 빠름)
+        return pd.read_csv(path_str, encoding='utf-8-sig', quotechar='"',
+                           engine='pyarrow')
+    except (ImportError, ValueError) as e:
+        # pyarrow 미설치 또는 엔진이 지원하지 않는 옵션 조합이면 기본 파서로
+        logger.info(f"pyarrow CSV 엔진 사용 불가 (기본 파서로 폴백): {e}")
+        return pd.read_csv(path_str, encoding='utf-8-sig', quotechar='"')
+
+
+@lru_cache(maxsize=16)
+def _read_excel_cached(path_str: str, mtime_ns: int, engine: str,
+                       usecols=None, skiprows=None) -> pd.DataFrame:
+    return pd.read_excel(
+        path_str, engine=engine,
+        usecols=list(usecols) if usecols is not None else None,
+        skiprows=list(skiprows) if skiprows is not None else None,
+    )
+
+
+@lru_cache(maxsize=16)
+def _read_parquet_cached(path_str: str, mtime_ns: int) -> pd.DataFrame:
+    return pd.read_parquet(path_str)
+
+
+def _load_parquet_if_fresh(source_path: Path):
+    """원본 옆의 Parquet 변환본이 최신이면 그것을 읽음 (CSV/XLS 파싱 대비 수십 배 빠름)"""
+    pq_path = source_path.with_suffix('.parquet')
+    try:
+        if pq_path.exists() and pq_path.stat().st_mtime_ns >= source_path.stat().st_mtime_ns:
+            return _read_parquet_cached(str(pq_path), pq_path.stat().st_mtime_ns)
+    except Exception as e:
+        logger.warning(f"Parquet 변환본 읽기 실패 (원본으로 폴백): {pq_path}, {e}")
+    return None
+
+
+def _write_parquet(df: pd.DataFrame, source_path: Path):
+    """파싱 결과를 Parquet으로 저장해 다음 프로세스부터 바로 읽게 함 (실패해도 무시)"""
+    try:
+        df.to_parquet(source_path.with_suffix('.parquet'), index=False)
+    except Exception as e:
+        logger.warning(f"Parquet 변환본 저장 실패: {source_path}, {e}")
+
+
+class SeoulMethod(object):
     """서울 범죄 데이터 전처리 메서드 클래스"""
 
     def __init__(self):
         """초기화"""
         self.dataset = SeoulDataset()
         self.kakao_map = KakaoMapSingleton()
+        self._valid_districts = None  # 유효 자치구 집합 (지연 로드)
+        self._station_district_cache = {}  # 관서명 → 자치구 메모이즈
 
     # DS -> DF
     def csv_to_df(self, fname: str) -> pd.DataFrame:
@@ -25,7 +91,12 @@ class SeoulMethod(object):
         csv_path = base_path / fname
         if not csv_path.exists():
             raise FileNotFoundError(f"파일을 찾을 수 없습니다: {csv_path}")
-        return pd.read_csv(csv_path, encoding='utf-8-sig', quotechar='"')
+        # 얕은 복사 반환: 캐시 원본을 호출자가 오염시키지 않도록 함
+        df = _load_parquet_if_fresh(csv_path)
+        if df is None:
+            df = _read_csv_cached(str(csv_path), csv_path.stat().st_mtime_ns)
+            _write_parquet(df, csv_path)
+        return df.copy(deep=False)
 
     def xlsx_to_df(self, fname: str) -> pd.DataFrame:
         """XLSX 파일을 읽어와서 DataFrame으로 반환"""
@@ -38,14 +109,23 @@ class SeoulMethod(object):
         # 파일 확장자에 따라 엔진 선택
         file_ext = xlsx_path.suffix.lower()
         engine = 'xlrd' if file_ext == '.xls' else 'openpyxl'
-        
+
+        df = _load_parquet_if_fresh(xlsx_path)
+        if df is not None:
+            return df.copy(deep=False)
         try:
-            return pd.read_excel(xlsx_path, engine=engine)
+            df = _read_excel_cached(str(xlsx_path), xlsx_path.stat().st_mtime_ns, engine)
+            _write_parquet(df, xlsx_path)
+            return df.copy(deep=False)
         except ImportError:
             raise ImportError(f"{engine} 패키지가 필요합니다. 'pip install {engine}'을 실행해주세요.")
-    
-    def xls_to_df(self, fname: str) -> pd.DataFrame:
-        """XLS 파일을 읽어와서 DataFrame으로 반환"""
+
+    def xls_to_df(self, fname: str, usecols=None, skiprows=None) -> pd.DataFrame:
+        """XLS 파일을 읽어와서 DataFrame으로 반환
+
+        usecols/skiprows를 주면 읽기 단계에서 필요한 컬럼·행만 파싱한다
+        (버릴 바이트를 xlrd가 파싱하지 않도록 함).
+        """
         # 경로 직접 지정: seoul_crime/data 디렉토리
         base_path = Path(__file__).parent / "data"
         xls_path = base_path / fname
@@ -55,13 +135,25 @@ class SeoulMethod(object):
         # 파일 확장자에 따라 엔진 선택
         file_ext = xls_path.suffix.lower()
         engine = 'xlrd' if file_ext == '.xls' else 'openpyxl'
-        
+
+        # Parquet 변환본과 디스크 캐시는 전체 읽기에만 적용
+        if usecols is None and skiprows is None:
+            df = _load_parquet_if_fresh(xls_path)
+            if df is not None:
+                return df.copy(deep=False)
         try:
-            return pd.read_excel(xls_path, engine=engine)
+            df = _read_excel_cached(
+                str(xls_path), xls_path.stat().st_mtime_ns, engine,
+                tuple(usecols) if usecols is not None else None,
+                tuple(skiprows) if skiprows is not None else None,
+            )
+            if usecols is None and skiprows is None:
+                _write_parquet(df, xls_path)
+            return df.copy(deep=False)
         except ImportError:
             raise ImportError(f"{engine} 패키지가 필요합니다. 'pip install {engine}'을 실행해주세요.")
     
-    def df_merge(self, right: pd.DataFrame, left: pd.DataFrame, left_on: str, right_on: str, how: str = 'left', keep_key: str = 'right') -> pd.DataFrame:
+    def df_merge(self, right: pd.DataFrame, left: pd.DataFrame, left_on: str, right_on: str, how: str = 'left', keep_key: str = 'right', validate: str = None) -> pd.DataFrame:
         """
         두 데이터프레임을 머지
         
@@ -72,47 +164,51 @@ class SeoulMethod(object):
             right_on: 오른쪽 데이터프레임의 키 컬럼명
             how: 머지 방식 ('left', 'right', 'inner', 'outer')
             keep_key: 머지 후 유지할 키 컬럼 ('right', 'left', 또는 둘 다 'both')
+            validate: 키 관계 검증 ('many_to_one' 등) — 위반 시 조용한 행 복제
+                대신 MergeError를 던짐
         
         Returns:
             머지된 데이터프레임
         """
-        # 중복된 컬럼 확인 및 제거 (키 컬럼 제외)
-        left_cols = set(left.columns) - {left_on}
-        right_cols = set(right.columns) - {right_on}
-        
-        # 중복된 컬럼이 있으면 왼쪽 데이터프레임에서 제거
-        overlap_cols = left_cols & right_cols
-        if overlap_cols:
-            logger.warning(f"중복된 컬럼이 발견되어 왼쪽 데이터프레임에서 제거합니다: {overlap_cols}")
+        # 중복 컬럼은 Index 연산으로 한 번에 계산해 왼쪽에서 제거 (키 컬럼 제외)
+        overlap_cols = left.columns.intersection(right.columns).difference([left_on, right_on])
+        if len(overlap_cols) > 0:
+            logger.warning(f"중복된 컬럼이 발견되어 왼쪽 데이터프레임에서 제거합니다: {set(overlap_cols)}")
             left = left.drop(columns=list(overlap_cols))
-        
-        # 머지 수행
-        merged_df = pd.merge(
-            right, 
-            left, 
-            left_on=right_on, 
-            right_on=left_on, 
-            how=how,
-            suffixes=('', '_duplicate')  # 중복 방지용 접미사 (사실상 사용되지 않음)
-        )
-        
-        # 접미사가 붙은 중복 컬럼 제거
-        duplicate_cols = [col for col in merged_df.columns if col.endswith('_duplicate')]
-        if duplicate_cols:
-            merged_df = merged_df.drop(columns=duplicate_cols)
-        
-        # 키 컬럼 중복 제거 처리
+
+        # 머지 수행 — 중복은 위에서 제거했으므로 접미사 스캔이 필요 없음
+        if how == 'left':
+            # 왼쪽 프레임을 키 인덱스로 세워 pandas의 인덱스 조인 경로 사용
+            # (merge의 양측 해시 테이블 재구축 대비 수 배 빠름)
+            indexed_left = left.set_index(left_on)
+            if validate in ('many_to_one', 'm:1', 'one_to_one', '1:1') \
+                    and not indexed_left.index.is_unique:
+                raise pd.errors.MergeError(
+                    f"머지 키가 왼쪽 데이터프레임에서 유일하지 않습니다: {left_on}"
+                )
+            merged_df = right.join(indexed_left, on=right_on, how='left')
+            # merge 결과와 동일하게 왼쪽 키 컬럼을 복원 (미매칭 행은 NaN)
+            merged_df[left_on] = right[right_on].where(
+                right[right_on].isin(indexed_left.index)
+            )
+            merged_df = merged_df[list(right.columns) + list(left.columns)]
+            merged_df = merged_df.reset_index(drop=True)
+        else:
+            merged_df = right.merge(
+                left,
+                left_on=right_on,
+                right_on=left_on,
+                how=how,
+                copy=False,
+                validate=validate
+            )
+
+        # 키 컬럼 중복 제거 처리 (keep_key == 'both'면 둘 다 유지)
         if keep_key == 'right':
-            # 오른쪽 키 컬럼 유지, 왼쪽 키 컬럼 제거
-            if left_on in merged_df.columns:
-                merged_df = merged_df.drop(columns=[left_on])
+            merged_df = merged_df.drop(columns=[left_on], errors='ignore')
         elif keep_key == 'left':
-            # 왼쪽 키 컬럼 유지, 오른쪽 키 컬럼 제거
-            if right_on in merged_df.columns:
-                merged_df = merged_df.drop(columns=[right_on])
-            # 왼쪽 키 컬럼명은 그대로 유지 (자치구)
-        # keep_key == 'both'인 경우 둘 다 유지
-        
+            merged_df = merged_df.drop(columns=[right_on], errors='ignore')
+
         return merged_df
     
     def station_to_district(self, station_name: str) -> str:
@@ -125,16 +221,32 @@ class SeoulMethod(object):
         Returns:
             자치구명 (예: "마포구", "강남구")
         """
+        # 메모이즈: 관서→자치구 매핑은 정적이므로 행마다 재계산하지 않음
+        cached = self._station_district_cache.get(station_name)
+        if cached is not None:
+            return cached
+        district = self._resolve_district(station_name)
+        self._station_district_cache[station_name] = district
+        return district
+
+    def _resolve_district(self, station_name: str) -> str:
+        """관서명 → 자치구 실제 변환 로직 (station_to_district가 결과를 캐시)"""
+        # 알려진 예외 먼저 확인 (API 폴백 없이 즉시 반환)
+        override = _STATION_DISTRICT_OVERRIDES.get(station_name)
+        if override is not None:
+            return override
+
         # 기본 규칙: "서" → "구" 변환
         if station_name.endswith("서"):
             district = station_name.replace("서", "구")
-            
-            # 유효한 자치구인지 확인 (CCTV 데이터의 자치구 목록과 비교)
-            cctv_df = self.csv_to_df("cctv.csv")
-            valid_districts = set(cctv_df['기관명'].tolist())
-            
+
+            # 유효한 자치구인지 확인 (CCTV 데이터의 자치구 목록, 인스턴스에 1회 캐시)
+            if self._valid_districts is None:
+                cctv_df = self.csv_to_df("cctv.csv")
+                self._valid_districts = frozenset(cctv_df['기관명'].unique().tolist())
+
             # 유효한 자치구면 반환
-            if district in valid_districts:
+            if district in self._valid_districts:
                 return district
             
             # 유효하지 않으면 카카오맵 API로 확인 (예외 케이스)
@@ -170,16 +282,14 @@ class SeoulMethod(object):
                     # 'sublocality_level_1' 또는 'administrative_area_level_2'에서 구 추출
                     if 'sublocality_level_1' in types or 'administrative_area_level_2' in types:
                         long_name = component.get('long_name', '')
-                        # "강남구" 형식에서 "구" 포함 여부 확인
-                        if '구' in long_name:
-                            return long_name
-                        elif long_name.endswith('구'):
+                        # "강남구" 형식 확인 (endswith 하나로 충분)
+                        if long_name.endswith('구'):
                             return long_name
                 
                 # formatted_address에서 추출 시도
                 formatted_address = geocode_result[0].get('formatted_address', '')
                 # "서울특별시 강남구 방배동" 형식에서 "강남구" 추출
-                match = re.search(r'([가-힣]+구)', formatted_address)
+                match = GU_RE.search(formatted_address)
                 if match:
                     return match.group(1)
             
@@ -1,153 +1,324 @@
 """
 Seoul Router - FastAPI 라우터
 """
+import asyncio
+import hashlib
+import logging
+import time
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, Any
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import HTMLResponse
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse
 from app.seoul_crime.seoul_service import SeoulService
 
-# 라우터 생성
-router = APIRouter(tags=["Seoul"])
+# 라우터 생성 — orjson 직렬화 + 블로킹 작업은 스레드풀로 위임
+router = APIRouter(tags=["Seoul"], default_response_class=ORJSONResponse)
+
+logger = logging.getLogger(__name__)
 
 # 서비스 인스턴스 생성
 seoul_service = SeoulService()
 
+# 동시 /ml/preprocess 요청을 하나의 파이프라인 실행으로 합치는 락
+_preprocess_lock = asyncio.Lock()
+
+
+@router.on_event("startup")
+async def warmup_seoul_service():
+    """기동 시 전처리를 미리 수행해 첫 요청의 콜드 비용 제거
+
+    preprocess는 상태 키 캐시를 채우고 crime_df_with_pop을 준비하므로
+    이후 /ml/preprocess와 /ml/map은 캐시에서 바로 응답한다.
+    실패해도 (예: API 키 미설정) 기동은 계속한다.
+    """
+    try:
+        await run_in_threadpool(seoul_service.preprocess)
+        # 대시보드가 병렬로 때리는 3개 조회를 한 번의 스레드풀 왕복으로 미리 채움
+        await run_in_threadpool(_warm_read_caches)
+        logger.info("✅ Seoul 전처리 워밍업 완료")
+    except Exception as e:
+        logger.warning(f"⚠️ Seoul 전처리 워밍업 실패 (첫 요청 시 재시도): {e}")
+
+
+# 조회 결과 메모이즈: 원본 데이터는 정적이므로 요청마다 pandas head/to_dict를
+# 반복하지 않음. preprocess가 다시 돌면 아래 훅으로 무효화.
+@lru_cache(maxsize=1)
+def _cctv_top5() -> Dict[str, Any]:
+    return seoul_service.get_cctv_top5()
+
+
+@lru_cache(maxsize=1)
+def _crime_top5() -> Dict[str, Any]:
+    return seoul_service.get_crime_top5()
+
+
+@lru_cache(maxsize=1)
+def _pop_top5() -> Dict[str, Any]:
+    return seoul_service.get_pop_top5()
+
+
+@lru_cache(maxsize=32)
+def _cctv_pop_merged(limit: int) -> Dict[str, Any]:
+    return seoul_service.get_cctv_pop_merged(limit=limit)
+
+
+@lru_cache(maxsize=32)
+def _pop_edited(limit: int) -> Dict[str, Any]:
+    return seoul_service.get_pop_edited(limit=limit)
+
+
+def _warm_read_caches():
+    """cctv/crime/pop 상위 5개 응답을 한 번에 계산해 캐시를 채움
+
+    대시보드는 /ml/cctv-5, /ml/crime-5, /ml/pop-5를 동시에 호출하므로
+    미리 채워두면 버스트가 전부 dict 조회로 끝난다.
+    """
+    _cctv_top5()
+    _crime_top5()
+    _pop_top5()
+
+
+def _overview() -> Dict[str, Any]:
+    """cctv/crime/pop 상위 5개 + 머지 결과를 하나의 응답으로 조립"""
+    return {
+        "cctv": _cctv_top5(),
+        "crime": _crime_top5(),
+        "pop": _pop_top5(),
+        "merged": _cctv_pop_merged(5),
+    }
+
+
+# 조회 응답별 ETag 메모이즈 — 데이터가 바뀌지 않는 한 재계산하지 않음
+_etag_cache: Dict[str, str] = {}
+
+
+def _payload_etag(name: str, payload: Dict[str, Any]) -> str:
+    """메모이즈된 응답의 ETag 계산 (전처리 재실행 시 캐시와 함께 무효화)"""
+    etag = _etag_cache.get(name)
+    if etag is None:
+        digest = hashlib.blake2b(
+            orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY), digest_size=8
+        ).hexdigest()
+        etag = f'"{digest}"'
+        _etag_cache[name] = etag
+    return etag
+
+
+def _conditional_json(request: Request, name: str, payload: Dict[str, Any]):
+    """If-None-Match가 일치하면 304로, 아니면 ETag를 붙여 본문 반환
+
+    정적 데이터라 반복 조회 클라이언트는 본문 재전송 없이 304로 끝난다.
+    """
+    etag = _payload_etag(name, payload)
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304)
+    return ORJSONResponse(payload, headers={"ETag": etag})
+
+
+def _clear_response_caches():
+    """전처리가 다시 실행되면 메모이즈된 응답을 무효화"""
+    _cctv_top5.cache_clear()
+    _crime_top5.cache_clear()
+    _pop_top5.cache_clear()
+    _cctv_pop_merged.cache_clear()
+    _pop_edited.cache_clear()
+    _etag_cache.clear()
+
 
 @router.get(
     "/ml/cctv-5",
-    response_model=Dict[str, Any],
     summary="CCTV 데이터 상위 5개 조회",
     description="서울시 자치구별 CCTV 설치현황 데이터 상위 5개를 반환합니다."
 )
-async def get_cctv_top5():
+async def get_cctv_top5(request: Request):
     """CCTV 데이터 상위 5개 조회"""
-    try:
-        return seoul_service.get_cctv_top5()
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"CCTV 데이터 조회 중 오류 발생: {str(e)}"
-        )
+    payload = await run_in_threadpool(_cctv_top5)
+    return _conditional_json(request, 'cctv-5', payload)
 
 
 @router.get(
     "/ml/crime-5",
-    response_model=Dict[str, Any],
     summary="범죄 데이터 상위 5개 조회",
     description="서울시 자치구별 5대 범죄 발생현황 데이터 상위 5개를 반환합니다."
 )
-async def get_crime_top5():
+async def get_crime_top5(request: Request):
     """범죄 데이터 상위 5개 조회"""
-    try:
-        return seoul_service.get_crime_top5()
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"범죄 데이터 조회 중 오류 발생: {str(e)}"
-        )
+    payload = await run_in_threadpool(_crime_top5)
+    return _conditional_json(request, 'crime-5', payload)
 
 
 @router.get(
     "/ml/pop-5",
-    response_model=Dict[str, Any],
     summary="인구 데이터 상위 5개 조회",
     description="서울시 자치구별 인구 데이터 상위 5개를 반환합니다."
 )
-async def get_pop_top5():
+async def get_pop_top5(request: Request):
     """인구 데이터 상위 5개 조회"""
-    try:
-        return seoul_service.get_pop_top5()
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"인구 데이터 조회 중 오류 발생: {str(e)}"
-        )
+    payload = await run_in_threadpool(_pop_top5)
+    return _conditional_json(request, 'pop-5', payload)
+
+
+@router.get(
+    "/ml/overview",
+    summary="대시보드 통합 조회",
+    description="CCTV/범죄/인구 상위 5개와 CCTV-POP 머지 결과를 한 번의 요청으로 반환합니다."
+)
+async def get_overview(request: Request):
+    """대시보드 통합 조회
+
+    프런트가 /ml/cctv-5, /ml/crime-5, /ml/pop-5, /ml/cctv-pop-merged를
+    연달아 호출하는 패턴을 라우팅·직렬화 1회로 합친다.
+    개별 엔드포인트와 같은 메모이즈 빌더를 재사용하므로 계산은 공유됨.
+    """
+    payload = await run_in_threadpool(_overview)
+    return _conditional_json(request, 'overview', payload)
 
 
 @router.get(
     "/ml/preprocess",
-    response_model=Dict[str, Any],
     summary="데이터 전처리 및 머지",
     description="CCTV, 범죄, 인구 데이터를 로드하고 CCTV-POP 머지를 수행합니다."
 )
 async def preprocess():
     """데이터 전처리 및 머지"""
-    try:
-        return seoul_service.preprocess()
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"데이터 전처리 중 오류 발생: {str(e)}"
-        )
+    # 단일 실행 보장: 동시 요청은 락에서 대기했다가 먼저 끝난 실행이
+    # 채운 상태 키 캐시에서 즉시 응답받음 (N중 파이프라인 실행 방지)
+    async with _preprocess_lock:
+        result = await run_in_threadpool(seoul_service.preprocess)
+    _clear_response_caches()  # 전처리 후 메모이즈된 조회 응답 무효화
+    return result
 
 
 @router.get(
     "/ml/cctv-pop-merged",
-    response_model=Dict[str, Any],
     summary="CCTV-POP 머지 데이터 조회",
     description="CCTV와 인구 데이터를 머지한 결과를 반환합니다."
 )
 async def get_cctv_pop_merged(limit: int = 5):
     """CCTV-POP 머지 데이터 조회"""
-    try:
-        return seoul_service.get_cctv_pop_merged(limit=limit)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"CCTV-POP 머지 데이터 조회 중 오류 발생: {str(e)}"
-        )
+    return await run_in_threadpool(_cctv_pop_merged, limit)
 
 
 @router.get(
     "/ml/pop-edited",
-    response_model=Dict[str, Any],
     summary="POP 데이터 편집 결과 조회",
     description="POP 데이터에서 컬럼과 행을 삭제한 결과를 반환합니다."
 )
 async def get_pop_edited(limit: int = 10):
     """POP 데이터 편집 결과 조회"""
+    return await run_in_threadpool(_pop_edited, limit)
+
+
+# 지도 HTML 캐시 설정: 폴리곤 렌더링이 초 단위로 걸리므로 저장본을 재사용
+_MAP_TTL_SECONDS = 24 * 3600
+_map_lock = asyncio.Lock()  # 콜드 캐시 동시 요청의 중복 생성 방지
+
+# 저장 경로는 고정이므로 임포트 시 1회만 계산/생성 (요청마다 경로 연산·mkdir 제거)
+_SAVE_DIR = Path(__file__).parent / "save"
+_SAVE_DIR.mkdir(parents=True, exist_ok=True)
+_MAP_FILE = _SAVE_DIR / "seoul_crime.html"
+_MAP_FILE_GZ = _SAVE_DIR / "seoul_crime.html.gz"  # 빌드 시 생성되는 사전 압축본
+# 지도는 TTL 기반으로 재생성되므로 중간 캐시가 1시간은 재사용해도 안전
+_MAP_CACHE_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+
+def _map_file_path() -> Path:
+    return _MAP_FILE
+
+
+def _map_response(map_file: Path, request: Request) -> FileResponse:
+    """지도 HTML 응답 생성 — gzip을 받는 클라이언트에는 사전 압축본 전송
+
+    빌드 시 만든 .gz 파일을 그대로 보내면 미들웨어의 요청별 압축 CPU를
+    전부 건너뛴다. 압축본이 없거나 원본보다 오래됐으면 원본으로 폴백.
+    """
     try:
-        return seoul_service.get_pop_edited(limit=limit)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"POP 데이터 편집 결과 조회 중 오류 발생: {str(e)}"
-        )
+        if ('gzip' in request.headers.get('accept-encoding', '')
+                and _MAP_FILE_GZ.exists()
+                and _MAP_FILE_GZ.stat().st_mtime >= map_file.stat().st_mtime):
+            return FileResponse(
+                _MAP_FILE_GZ,
+                media_type="text/html",
+                headers={**_MAP_CACHE_HEADERS,
+                         "Content-Encoding": "gzip",
+                         "Vary": "Accept-Encoding"},
+            )
+    except OSError:
+        pass
+    return FileResponse(map_file, media_type="text/html", headers=_MAP_CACHE_HEADERS)
+
+
+def _map_file_fresh(map_file: Path) -> bool:
+    """저장된 지도 HTML이 TTL 이내인지 확인"""
+    try:
+        return map_file.exists() and time.time() - map_file.stat().st_mtime < _MAP_TTL_SECONDS
+    except OSError:
+        return False
+
+
+def _build_map_html() -> str:
+    """전처리 + 지도 HTML 생성 (동기 — 스레드풀에서 실행)"""
+    seoul_service.preprocess()
+
+    # 히트맵과 동일한 데이터 사용 (preprocess()에서 생성된 crime_df_with_pop)
+    crime_df_with_pop = seoul_service.crime_df_with_pop
+
+    # 지도 HTML 생성 (인구수가 이미 포함된 데이터프레임 전달, pop_df는 None)
+    return seoul_service.generate_crime_rate_map(
+        crime_df_with_pop, pop_df=None, save_path=_SAVE_DIR
+    )
 
 
 @router.get(
     "/ml/map",
     summary="범죄율 지도 HTML 반환",
-    description="서울시 자치구별 범죄율 지도 HTML을 반환합니다. 항상 최신 코드로 재생성됩니다.",
+    description="서울시 자치구별 범죄율 지도 HTML을 반환합니다. 저장본이 유효하면 재생성 없이 반환하며, POST /ml/map/refresh로 무효화할 수 있습니다.",
     response_class=HTMLResponse
 )
-async def get_crime_rate_map():
+async def get_crime_rate_map(request: Request):
     """
     범죄율 지도 HTML 반환
-    
-    항상 최신 코드로 지도를 재생성하여 반환합니다.
-    save 폴더에 seoul_crime.html로 저장됩니다.
+
+    save 폴더의 seoul_crime.html이 TTL 이내면 그대로 스트리밍하고,
+    없거나 오래됐을 때만 락 아래에서 한 번 재생성합니다.
     """
-    try:
-        # 데이터 전처리
-        seoul_service.preprocess()
-        
-        # 히트맵과 동일한 데이터 사용 (preprocess()에서 생성된 crime_df_with_pop)
-        # 인구수가 이미 포함된 데이터프레임 사용
-        crime_df_with_pop = seoul_service.crime_df_with_pop
-        
-        # save 폴더 경로 설정
-        from pathlib import Path
-        save_path = Path(__file__).parent.parent / "seoul_crime" / "save"
-        save_path.mkdir(parents=True, exist_ok=True)
-        
-        # 지도 HTML 생성 (인구수가 이미 포함된 데이터프레임 전달, pop_df는 None)
-        html_str = seoul_service.generate_crime_rate_map(crime_df_with_pop, pop_df=None, save_path=save_path)
-        
-        return HTMLResponse(content=html_str)
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"지도 생성 중 오류 발생: {str(e)}"
-        )
+    map_file = _map_file_path()
+    if _map_file_fresh(map_file):
+        return _map_response(map_file, request)
+
+    async with _map_lock:
+        # 락 획득 후 재확인: 먼저 들어온 요청이 이미 생성했을 수 있음
+        if _map_file_fresh(map_file):
+            return _map_response(map_file, request)
+        html_str = await run_in_threadpool(_build_map_html)
+        if map_file.exists():
+            # 생성 직후에도 디스크 저장본을 sendfile로 스트리밍 —
+            # 수 MB HTML 문자열의 응답 복사본을 만들지 않음
+            return _map_response(map_file, request)
+
+    # 디스크 저장이 실패했을 때만 메모리 문자열로 폴백
+    return HTMLResponse(content=html_str, headers=_MAP_CACHE_HEADERS)
+
+
+@router.post(
+    "/ml/map/refresh",
+    summary="범죄율 지도 캐시 무효화",
+    description="저장된 지도 HTML을 삭제하여 다음 요청에서 재생성되도록 합니다."
+)
+async def refresh_crime_rate_map():
+    """지도 HTML 캐시 무효화"""
+    map_file = _map_file_path()
+    existed = map_file.exists()
+    if existed:
+        try:
+            map_file.unlink()
+        except OSError as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"지도 캐시 삭제 중 오류 발생: {str(e)}"
+            )
+    return {"status": "success", "invalidated": existed}
 